@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Build settings shared by build_gui_exe.py, scripts/build_simple_installer.py
+and scripts/kamiwaza_installer.spec
+"""
+
+import contextlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent
+
+# Binaries that break when UPX-packed (Windows refuses to load a packed VC runtime)
+UPX_EXCLUDE = [
+    "vcruntime140.dll",
+    "vcruntime140_1.dll",
+    "python3.dll",
+    f"python3{sys.version_info.minor}.dll",
+]
+
+# Serializes output-directory cleanup between concurrent installer builds that
+# share build/ and dist/ (filelock is optional; without it cleanup is unguarded)
+try:
+    from filelock import FileLock
+except ImportError:
+    FileLock = None
+
+BUILD_LOCK_FILE = os.path.join(ROOT_DIR, ".build.lock")
+
+def build_lock():
+    """Return a context manager guarding cleanup of the shared build dirs."""
+    return FileLock(BUILD_LOCK_FILE) if FileLock else contextlib.nullcontext()
+
+def find_upx():
+    """Path to UPX: the copy pinned in tools/ if present, otherwise from PATH"""
+    bundled = ROOT_DIR / "tools" / "upx.exe"
+    return str(bundled) if bundled.is_file() else shutil.which("upx")
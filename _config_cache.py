@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Typed, hash-keyed cache for config.yaml
+
+The parsed config is pickled next to the YAML file (config.yaml.cache.pkl),
+prefixed with a BLAKE2b digest of the raw YAML bytes and the field schema, so
+unchanged configs are loaded without running the YAML parser.
+"""
+
+import hashlib
+import pickle
+import typing
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+_DIGEST_SIZE = 16
+
+@dataclass(frozen=True, slots=True)
+class InstallerConfig:
+    """Values read from config.yaml"""
+    kamiwaza_version: str = ''
+    codename: str = ''
+    build_number: int = 1
+    arch: str = ''
+    r2_endpoint_url: str = ''
+    deb_file_url: str = ''
+
+# Field name -> type; resolved once so string annotations (PEP 563) still coerce
+_FIELD_TYPES = typing.get_type_hints(InstallerConfig)
+
+# Mixed into the digest so adding, renaming or retyping a field invalidates old caches
+_SCHEMA = repr(_FIELD_TYPES).encode('utf-8')
+
+def _parse(raw):
+    """Build an InstallerConfig from raw YAML bytes, ignoring unknown keys."""
+    data = yaml.load(raw, Loader=_Loader) or {}
+    values = {}
+    for field in fields(InstallerConfig):
+        value = data.get(field.name)
+        if value is not None:
+            values[field.name] = _FIELD_TYPES[field.name](value)
+    return InstallerConfig(**values)
+
+def load(path='config.yaml'):
+    """Load config.yaml, reusing the pickled result while the file is unchanged."""
+    raw = Path(path).read_bytes()
+    digest = hashlib.blake2b(_SCHEMA + b'\0' + raw, digest_size=_DIGEST_SIZE).digest()
+    cache = Path(str(path) + '.cache.pkl')
+
+    try:
+        with cache.open('rb') as f:
+            if f.read(_DIGEST_SIZE) == digest:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass  # Missing or corrupt cache; rebuilt below
+
+    config = _parse(raw)
+    try:
+        with cache.open('wb') as f:
+            f.write(digest)
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return config
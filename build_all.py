@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Parallel Build Script for Kamiwaza Executables
+Builds kamiwaza_installer.exe and KamiwazaGUIManager.exe concurrently.
+
+Each PyInstaller run is independent and its analysis phase is largely
+single-threaded, so the two builds are dispatched to separate processes.
+Every target gets its own --distpath/--workpath so the runs never clean up
+each other's directories; the results are merged into dist/ afterwards.
+"""
+
+import os
+import sys
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+import build_gui_exe
+import build_simple_installer
+
+# Target name -> (dist dir, work dir), relative to ROOT_DIR
+TARGETS = {
+    "kamiwaza_installer": (os.path.join("dist", "kw"), os.path.join("build", "kw")),
+    "KamiwazaGUIManager": (os.path.join("dist", "mgr"), os.path.join("build", "mgr")),
+}
+
+def _build_target(name):
+    """Build a single target in its own directories (runs in a worker process)."""
+    dist_dir, work_dir = TARGETS[name]
+    if name == "kamiwaza_installer":
+        return build_simple_installer.build_executable(dist_dir=dist_dir, work_dir=work_dir)
+    return build_gui_exe.build_gui_exe(dist_dir=dist_dir, work_dir=work_dir)
+
+def _merge_into_dist(src_dir, dest_dir="dist"):
+    """Move everything from a per-target dist dir into the shared dist dir."""
+    for entry in os.listdir(src_dir):
+        src = os.path.join(src_dir, entry)
+        dest = os.path.join(dest_dir, entry)
+        shutil.rmtree(dest, ignore_errors=True)
+        os.replace(src, dest)
+    os.rmdir(src_dir)
+
+def main():
+    """Main build process"""
+    print("=== Kamiwaza Parallel Build ===\n")
+
+    # Both build scripts (and the dirs above) resolve paths against the cwd;
+    # the worker processes inherit it
+    os.chdir(ROOT_DIR)
+
+    # pip must not run concurrently with itself, so install requirements first
+    if not build_simple_installer.check_requirements():
+        return 1
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(len(TARGETS), os.cpu_count() or 1)) as executor:
+        futures = {name: executor.submit(_build_target, name) for name in TARGETS}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Build error for {name}: {e}")
+                results[name] = False
+
+    for name, ok in results.items():
+        print(f"{'[OK]' if ok else '[FAIL]'} {name}")
+
+    if not all(results.values()):
+        print("\n=== Build Failed! ===")
+        return 1
+
+    for dist_dir, _ in TARGETS.values():
+        _merge_into_dist(dist_dir)
+
+    print("\n=== Build Complete! ===")
+    print("Executables are in the 'dist' folder")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
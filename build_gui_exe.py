@@ -6,12 +6,101 @@ Creates a standalone .exe file that can be distributed with the MSI installer
 
 import os
 import sys
-import subprocess
+import argparse
+import hashlib
 import shutil
+import subprocess
+import threading
 from pathlib import Path
 
-def build_gui_exe():
-    """Build the GUI manager as an executable"""
+from _build_common import UPX_EXCLUDE, find_upx
+
+# Generated PyInstaller spec; kept between runs so PyInstaller can reuse its
+# cached analysis in the work directory
+SPEC_FILE = "KamiwazaGUIManager.spec"
+SPEC_MARKER = "# makespec options: "
+
+def _generate_spec(spec_args, force=False):
+    """Write SPEC_FILE from makespec options unless it already matches them.
+
+    The options' hash is recorded on the spec's first line; leaving an
+    unchanged spec in place keeps PyInstaller's analysis cache valid.
+    """
+    marker = SPEC_MARKER + hashlib.sha256("\0".join(spec_args).encode("utf-8")).hexdigest() + "\n"
+    if not force:
+        try:
+            with open(SPEC_FILE, encoding="utf-8") as f:
+                if f.readline() == marker:
+                    print(f"Reusing {SPEC_FILE}")
+                    return
+        except FileNotFoundError:
+            pass
+    
+    subprocess.run([sys.executable, "-m", "PyInstaller.utils.cliutils.makespec", "--specpath=."] + spec_args,
+                   check=True)
+    spec = Path(SPEC_FILE)
+    spec.write_text(marker + spec.read_text(encoding="utf-8"), encoding="utf-8")
+    print(f"Generated {SPEC_FILE}")
+
+# Files bundled next to the GUI source (--add-data) and covered by the build stamp
+GUI_DATA_FILES = ["kamiwaza.ico", "detect_gpu.ps1", "cleanup_wsl_kamiwaza.ps1"]
+
+def _build_stamp(paths, options):
+    """BLAKE2b over the build inputs' contents and the build options"""
+    h = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        h.update(path.encode("utf-8") + b"\0")
+        try:
+            h.update(Path(path).read_bytes())
+        except FileNotFoundError:
+            h.update(b"<missing>")
+    h.update("\0".join(options).encode("utf-8"))
+    return h.hexdigest()
+
+def _precompile_tree(path):
+    """Compile loose .py files in a one-dir bundle at -OO, next to the source (-b),
+    and drop the sources that now have bytecode, so nothing compiles at first launch.
+    """
+    subprocess.run([sys.executable, "-OO", "-m", "compileall", "-q", "-b", "-j", "0", path], check=False)
+    removed = 0
+    for source in Path(path).rglob("*.py"):
+        if source.with_suffix(".pyc").exists():
+            source.unlink()
+            removed += 1
+    print(f"Precompiled bundled Python sources ({removed} .py files replaced by .pyc)")
+
+def _dir_size(path):
+    """Total size in bytes of all files below path.
+    Uses os.scandir: on Windows the DirEntry stat comes from the directory
+    listing itself, so no per-file stat call is needed.
+    """
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total += _dir_size(entry.path)
+            elif entry.is_file():
+                total += entry.stat().st_size
+    return total
+
+def build_gui_exe(dist_dir="dist", work_dir="build", onedir=False, clean=False, while_building=None):
+    """Build the GUI manager as an executable
+
+    dist_dir/work_dir are passed to PyInstaller as --distpath/--workpath so
+    that parallel builds (see build_all.py) each get their own directories.
+
+    With onedir=True the app is built as a KamiwazaGUIManager/ folder instead of
+    a single self-extracting exe, so launches no longer unpack the runtime to a
+    temp directory. The MSI currently packages the single exe, so this is opt-in.
+
+    The options are baked into KamiwazaGUIManager.spec, which is regenerated
+    only when they change; clean=True regenerates it and has PyInstaller drop
+    its cache for a full rebuild.
+
+    while_building, if given, is called once PyInstaller has started so that
+    independent work overlaps the build; PyInstaller's output keeps streaming
+    meanwhile, so the callback should not print.
+    """
     print("=== Building Kamiwaza GUI Manager Executable ===")
     
     # Check if PyInstaller is available
@@ -21,6 +110,7 @@ def build_gui_exe():
     except ImportError:
         print("PyInstaller not found. Installing...")
         subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
+        import PyInstaller
     
     # Check for required dependencies and install if missing
     required_packages = ['psutil', 'pystray', 'pillow', 'sv-ttk', 'pywinstyles']  # pillow provides PIL
@@ -61,35 +151,21 @@ def build_gui_exe():
         return False
     
     # Output directory
-    output_dir = "dist"
-    exe_path = os.path.join(output_dir, "KamiwazaGUIManager.exe")
-    
-    # Try to remove existing EXE, but continue if it fails (process might be running)
-    if os.path.exists(exe_path):
-        try:
-            os.remove(exe_path)
-            print("Removed existing executable")
-        except PermissionError:
-            print("Warning: Could not remove existing executable (may be running)")
-            print("PyInstaller will overwrite it during build")
+    output_dir = dist_dir
+    if onedir:
+        exe_path = os.path.join(output_dir, "KamiwazaGUIManager", "KamiwazaGUIManager.exe")
+    else:
+        exe_path = os.path.join(output_dir, "KamiwazaGUIManager.exe")
     
-    # Build command
-    build_cmd = [
-        "pyinstaller",
-        "--onefile",                    # Single executable
+    # Spec options
+    spec_args = [
+        "--onedir" if onedir else "--onefile",  # Folder or single executable
         "--windowed",                   # No console window
         "--name=KamiwazaGUIManager",    # Executable name
         "--icon=kamiwaza.ico",          # Icon file
-        "--add-data=kamiwaza.ico;.",    # Include icon
-        "--add-data=detect_gpu.ps1;.",  # Include GPU detection script
-        "--add-data=cleanup_wsl_kamiwaza.ps1;.",  # Include cleanup script
+        *(f"--add-data={name};." for name in GUI_DATA_FILES),  # Icon, GPU detection and cleanup scripts
         "--hidden-import=tkinter",      # Ensure tkinter is included
         "--hidden-import=tkinter.ttk",  # Include ttk widgets
-        "--hidden-import=subprocess",   # Include subprocess
-        "--hidden-import=threading",    # Include threading
-        "--hidden-import=json",         # Include JSON
-        "--hidden-import=datetime",     # Include datetime
-        "--hidden-import=pathlib",      # Include pathlib
         "--hidden-import=psutil",       # Include psutil for process management
         "--hidden-import=pystray",      # Include pystray for system tray
         "--hidden-import=PIL",          # Include PIL for image handling
@@ -100,27 +176,131 @@ def build_gui_exe():
         "--hidden-import=atexit",       # Include atexit
         "--hidden-import=sv_ttk",       # Include Sun Valley theme
         "--hidden-import=pywinstyles",  # Include Windows styling
+        "--exclude-module=unittest",    # Unused stdlib test/dev packages
+        "--exclude-module=test",
+        "--exclude-module=tkinter.test",
+        "--exclude-module=pydoc_data",
+        "--exclude-module=lib2to3",
+        "--exclude-module=distutils",
+        "--exclude-module=setuptools",
+        "--exclude-module=pip",
+        "--exclude-module=numpy",       # Heavy optional deps pulled in by Pillow hooks
+        "--exclude-module=pandas",
+        "--exclude-module=pytest",
+        "--exclude-module=xmlrpc",
         source_file
     ]
     
-    print(f"Build command: {' '.join(build_cmd)}")
+    from packaging.version import Version  # Installed as a PyInstaller dependency
+    pyinstaller_version = Version(PyInstaller.__version__)
+    pyinstaller_major = pyinstaller_version.major
+    
+    # PyInstaller 6.6+ sets the bytecode optimization level of collected modules explicitly
+    # (older releases reject the option; the -OO interpreter below covers them)
+    if pyinstaller_version >= Version("6.6"):
+        spec_args.insert(-1, "--optimize=2")
+    
+    # Keep the runtime files in a predictable subfolder next to the exe
+    # (the flag only exists in PyInstaller 6+, where it is also the default)
+    if onedir and pyinstaller_major >= 6:
+        spec_args.insert(-1, "--contents-directory=_internal")
+    
+    # Strip debug symbols only on request (KAMIWAZA_BUILD_STRIP=1): PyInstaller advises
+    # against it on Windows, and whatever strip is on PATH (e.g. MinGW from Git for
+    # Windows) can corrupt python3*.dll and .pyd files or break their signatures
+    if os.environ.get("KAMIWAZA_BUILD_STRIP") == "1":
+        if shutil.which("strip"):
+            spec_args.insert(-1, "--strip")
+        else:
+            print("KAMIWAZA_BUILD_STRIP=1 but no strip tool found, building unstripped")
+    
+    # Build command; run PyInstaller under -OO so bytecode is collected
+    # without docstrings/asserts
+    build_cmd = [
+        sys.executable, "-OO", "-m", "PyInstaller",
+        "--noconfirm",                  # Replace previous output without prompting
+        f"--distpath={output_dir}",     # Output directory
+        f"--workpath={work_dir}",       # Intermediate build directory
+    ]
+    if clean:
+        build_cmd.append("--clean")     # Drop PyInstaller's cache for a full rebuild
+    
+    # Compress collected binaries with UPX if it is available
+    upx = find_upx()
+    if upx:
+        spec_args[-1:-1] = [f"--upx-exclude={name}" for name in UPX_EXCLUDE]
+        build_cmd.append(f"--upx-dir={os.path.dirname(upx)}")
+    else:
+        print("UPX not found, building without compression")
+    build_cmd.append(SPEC_FILE)
+    
+    # Skip the build entirely when the exe was produced from identical inputs
+    stamp_file = os.path.join(output_dir, ".KamiwazaGUIManager.stamp")
+    stamp = _build_stamp([source_file] + GUI_DATA_FILES, spec_args + [PyInstaller.__version__, f"upx={bool(upx)}"])
+    if not clean and not os.environ.get("FORCE_REBUILD") and os.path.exists(exe_path):
+        try:
+            with open(stamp_file) as f:
+                if f.read().strip() == stamp:
+                    print(f"{exe_path} is up to date, skipping build (set FORCE_REBUILD=1 to override)")
+                    if while_building:
+                        while_building()
+                    return True
+        except FileNotFoundError:
+            pass
     
+    # Try to remove existing EXE, but continue if it fails (process might be running)
     try:
-        # Run the build
-        result = subprocess.run(build_cmd, check=True, capture_output=True, text=True)
-        print("Build completed successfully!")
+        Path(exe_path).unlink()
+        print("Removed existing executable")
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        print("Warning: Could not remove existing executable (may be running)")
+        print("PyInstaller will overwrite it during build")
+    
+    try:
+        _generate_spec(spec_args, force=clean)
+        print(f"Build command: {' '.join(build_cmd)}")
+        
+        # Run the build, streaming PyInstaller's log as it is produced
+        process = subprocess.Popen(build_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1)
+        # Drain the pipe from a thread so PyInstaller never blocks on a full
+        # pipe while while_building runs
         print("Build output:")
-        print(result.stdout)
+        drain = threading.Thread(target=lambda: sys.stdout.writelines(process.stdout), daemon=True)
+        drain.start()
+        if while_building:
+            try:
+                while_building()
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+        returncode = process.wait()
+        drain.join()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, build_cmd)
+        print("Build completed successfully!")
         
         # Check if executable was created
-        exe_path = os.path.join(output_dir, "KamiwazaGUIManager.exe")
         if os.path.exists(exe_path):
             print(f"Executable created: {exe_path}")
             
-            # Get file size
-            size_mb = os.path.getsize(exe_path) / (1024 * 1024)
-            print(f"Executable size: {size_mb:.1f} MB")
+            # PYZ modules are already bytecode; this covers .py collected as data
+            if onedir:
+                _precompile_tree(os.path.join(os.path.dirname(exe_path), "_internal"))
             
+            # Get file size (whole folder for one-dir builds)
+            if onedir:
+                size_mb = _dir_size(os.path.dirname(exe_path)) / (1024 * 1024)
+                print(f"Application folder size: {size_mb:.1f} MB")
+            else:
+                size_mb = os.path.getsize(exe_path) / (1024 * 1024)
+                print(f"Executable size: {size_mb:.1f} MB")
+            
+            with open(stamp_file, "w") as f:
+                f.write(stamp)
             return True
         else:
             print("ERROR: Executable not found after build!")
@@ -128,74 +308,17 @@ def build_gui_exe():
             
     except subprocess.CalledProcessError as e:
         print(f"Build failed with exit code {e.returncode}")
-        print("Error output:")
-        print(e.stderr)
+        print("See the build output above for details")
         return False
     except Exception as e:
         print(f"Build error: {e}")
         return False
 
-def create_installer_integration():
-    """Create files needed for MSI installer integration"""
-    print("\n=== Creating MSI Installer Integration ===")
-    
-    # Create the GUI installation script
-    gui_install_script = """@echo off
-REM Install Kamiwaza GUI Manager to AppData and Start Menu
-REM This script is called by the MSI installer
-
-setlocal enabledelayedexpansion
-
-echo Installing Kamiwaza GUI Manager...
-
-REM Get the source executable path (from MSI installer)
-set "SOURCE_EXE=%~dp0KamiwazaGUIManager.exe"
-set "TARGET_DIR=%LOCALAPPDATA%\\Kamiwaza\\GUI"
-set "START_MENU_DIR=%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs\\Kamiwaza"
-
-REM Create target directories
-if not exist "%TARGET_DIR%" mkdir "%TARGET_DIR%"
-if not exist "%START_MENU_DIR%" mkdir "%START_MENU_DIR%"
+INTEGRATION_SCRIPT = "install_gui_manager.ps1"
 
-REM Copy the executable
-if exist "%SOURCE_EXE%" (
-    copy "%SOURCE_EXE%" "%TARGET_DIR%\\" >nul
-    echo Copied GUI Manager to: %TARGET_DIR%
-    
-    REM Create Start Menu shortcut
-    echo @echo off > "%START_MENU_DIR%\\Kamiwaza Monitor.lnk"
-    echo start "" "%TARGET_DIR%\\KamiwazaGUIManager.exe" >> "%START_MENU_DIR%\\Kamiwaza Monitor.lnk"
-    
-    REM Create desktop shortcut if requested
-    if "%1"=="--desktop" (
-        set "DESKTOP_DIR=%USERPROFILE%\\Desktop"
-        if exist "%DESKTOP_DIR%" (
-            echo @echo off > "%DESKTOP_DIR%\\Kamiwaza Monitor.lnk"
-            echo start "" "%TARGET_DIR%\\KamiwazaGUIManager.exe" >> "%DESKTOP_DIR%\\Kamiwaza Monitor.lnk"
-            echo Created desktop shortcut
-        )
-    )
-    
-    echo GUI Manager installation completed successfully!
-) else (
-    echo ERROR: Source executable not found: %SOURCE_EXE%
-    exit /b 1
-)
-
-echo.
-echo Kamiwaza Monitor is now available:
-echo - Start Menu: Start > Kamiwaza > Kamiwaza Monitor
-echo - Direct path: %TARGET_DIR%\\KamiwazaGUIManager.exe
-echo.
-echo You can now use the GUI to manage your Kamiwaza installation!
-"""
-    
-    with open("install_gui_manager.ps1", "w") as f:
-        f.write(gui_install_script)
-    
-    print("Created GUI installation script: install_gui_manager.ps1")
-    
-    # Create PowerShell version for better integration
+def create_installer_integration(path=INTEGRATION_SCRIPT):
+    """Create files needed for MSI installer integration"""
+    # PowerShell installation script run by the MSI
     ps_install_script = """# Install Kamiwaza GUI Manager to AppData and Start Menu
 # This script is called by the MSI installer
 
@@ -205,8 +328,10 @@ param(
 
 Write-Host "Installing Kamiwaza GUI Manager..." -ForegroundColor Green
 
-# Get the source executable path (from MSI installer)
+# Get the source executable path (from MSI installer); a one-dir build ships a
+# KamiwazaGUIManager folder instead of the single executable
 $scriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path
+$sourceDir = Join-Path $scriptDir "KamiwazaGUIManager"
 $sourceExe = Join-Path $scriptDir "KamiwazaGUIManager.exe"
 $targetDir = Join-Path $env:LOCALAPPDATA "Kamiwaza\\GUI"
 $startMenuDir = Join-Path $env:APPDATA "Microsoft\\Windows\\Start Menu\\Programs\\Kamiwaza"
@@ -219,9 +344,23 @@ if (!(Test-Path $startMenuDir)) {
     New-Item -ItemType Directory -Path $startMenuDir -Force | Out-Null
 }
 
-# Copy the executable
-if (Test-Path $sourceExe) {
-    Copy-Item $sourceExe $targetDir -Force
+# Copy the application
+$installed = $false
+if (Test-Path (Join-Path $sourceDir "KamiwazaGUIManager.exe")) {
+    # Mirror the whole one-dir folder (exe + _internal)
+    robocopy $sourceDir $targetDir /MIR /NFL /NDL /NJH /NJS /NP | Out-Null
+    if ($LASTEXITCODE -ge 8) {
+        Write-Error "Failed to copy GUI Manager folder (robocopy exit code $LASTEXITCODE)"
+        exit 1
+    }
+    $installed = $true
+} elseif (Test-Path $sourceExe) {
+    # File.Copy is a direct kernel32 CopyFile call (no provider pipeline or Add-Type compile)
+    [System.IO.File]::Copy($sourceExe, (Join-Path $targetDir "KamiwazaGUIManager.exe"), $true)
+    $installed = $true
+}
+
+if ($installed) {
     Write-Host "Copied GUI Manager to: $targetDir" -ForegroundColor Green
     
     # Create Start Menu shortcut using WScript.Shell
@@ -271,31 +410,47 @@ Write-Host ""
 Write-Host "You can now use the GUI to manage your Kamiwaza installation!" -ForegroundColor Green
 """
     
-    with open("install_gui_manager.ps1", "w") as f:
-        f.write(ps_install_script)
-    
-    print("Created PowerShell GUI installation script: install_gui_manager.ps1")
+    # UTF-8 with BOM and CRLF, as Windows PowerShell expects
+    Path(path).write_text(ps_install_script, encoding="utf-8-sig", newline="\r\n")
 
 def main():
     """Main build process"""
+    parser = argparse.ArgumentParser(description="Build the Kamiwaza GUI Manager executable")
+    parser.add_argument("--onedir", action="store_true",
+                        help="Build a KamiwazaGUIManager folder instead of a self-extracting single exe")
+    parser.add_argument("--clean", action="store_true",
+                        help="Regenerate the spec and discard PyInstaller's cache (full rebuild)")
+    args = parser.parse_args()
+    
     print("Kamiwaza GUI Manager Build Process")
     print("==================================")
     
-    # Build the executable
-    if build_gui_exe():
+    # Build the executable, creating the installer integration files while
+    # PyInstaller runs; they are staged and only put in place if the build succeeds
+    staged = INTEGRATION_SCRIPT + ".tmp"
+    if build_gui_exe(onedir=args.onedir, clean=args.clean,
+                     while_building=lambda: create_installer_integration(staged)):
         print("\n✅ Executable built successfully!")
         
-        # Create installer integration files
-        create_installer_integration()
+        print("\n=== Creating MSI Installer Integration ===")
+        os.replace(staged, INTEGRATION_SCRIPT)
+        print(f"Created PowerShell GUI installation script: {INTEGRATION_SCRIPT}")
         
         print("\n🎉 Build process completed!")
         print("\nNext steps:")
-        print("1. The executable is in the 'dist' folder")
+        if args.onedir:
+            print("1. The application folder is 'dist\\KamiwazaGUIManager'")
+        else:
+            print("1. The executable is in the 'dist' folder")
         print("2. Copy it to your MSI installer source directory")
         print("3. Update installer.wxs to include the GUI installation")
         print("4. Test the MSI installer")
         
     else:
+        try:
+            os.remove(staged)
+        except FileNotFoundError:
+            pass
         print("\n❌ Build failed!")
         return 1
     
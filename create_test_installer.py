@@ -5,10 +5,43 @@ by replacing the DEB_FILE_URL placeholder with a test URL
 """
 
 import os
-import shutil
-import importlib.util
+import copy
+import functools
 import argparse
-import time
+import tempfile
+
+import _config_cache
+
+DEB_URL_PLACEHOLDER = b'{{DEB_FILE_URL}}'
+
+def _stream_substitute(src, dst, replacement, header, chunk_size=1 << 16):
+    """Copy src to dst replacing DEB_URL_PLACEHOLDER, holding one chunk in memory.
+
+    header is inserted after the first (shebang) line. The output is written
+    to a temporary file next to dst and moved into place atomically.
+    """
+    overlap = len(DEB_URL_PLACEHOLDER) - 1
+    tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(dst)), delete=False)
+    try:
+        with tmp, open(src, 'rb') as f:
+            tmp.write(f.readline().replace(DEB_URL_PLACEHOLDER, replacement) + header)
+            carry = b''
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    tmp.write(carry)
+                    break
+                buf = carry + chunk
+                # Emit everything except a tail that could hold the start of a
+                # placeholder completed by the next chunk
+                last = buf.rfind(DEB_URL_PLACEHOLDER)
+                cut = max(len(buf) - overlap, last + len(DEB_URL_PLACEHOLDER) if last != -1 else 0)
+                tmp.write(buf[:cut].replace(DEB_URL_PLACEHOLDER, replacement))
+                carry = buf[cut:]
+        os.replace(tmp.name, dst)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
 
 def create_test_installer():
     """Create a testable version of the installer"""
@@ -16,14 +49,13 @@ def create_test_installer():
     # Read the config to get the DEB_FILE_URL
     deb_url = None
     try:
-        with open('config.yaml', 'r') as f:
-            for line in f:
-                if line.strip().startswith('deb_file_url:'):
-                    deb_url = line.split(':', 1)[1].strip()
-                    break
+        deb_url = _config_cache.load().deb_file_url
     except FileNotFoundError:
         print("config.yaml not found, using test URL")
         deb_url = "https://example.com/test-package.deb"
+    except ValueError as e:
+        print(f"Invalid value in config.yaml ({e}), using test URL")
+        deb_url = "https://example.com/test-package.deb"
     
     if not deb_url:
         print("No DEB_FILE_URL found in config.yaml, using test URL")
@@ -36,15 +68,23 @@ def create_test_installer():
     output_file = 'kamiwaza_headless_installer_test.py'
     
     try:
-        with open(template_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        tmpl_mtime = os.stat(template_file).st_mtime_ns
+        # Stamp written as the second line of the output (after the shebang) so
+        # the up-to-date check only has to read the head of the file
+        stamp = b'# Generated by create_test_installer.py, DEB_FILE_URL=' + deb_url.encode('utf-8') + b'\n'
         
-        # Replace the placeholder
-        content = content.replace('{{DEB_FILE_URL}}', deb_url)
+        # Skip the rewrite when the output is current for this template and URL
+        if os.path.exists(output_file) and os.stat(output_file).st_mtime_ns >= tmpl_mtime:
+            with open(output_file, 'rb') as f:
+                head = f.read(8192)
+            if stamp in head:
+                print(f"Testable installer is up to date: {output_file}")
+                return output_file
         
-        # Write the testable version
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Write the testable version, replacing the placeholder as it streams
+        _stream_substitute(template_file, output_file, deb_url.encode('utf-8'), stamp)
+        # Match the template's mtime so the staleness check above stays cheap
+        os.utime(output_file, ns=(tmpl_mtime, tmpl_mtime))
         
         print(f"Created testable installer: {output_file}")
         print(f"DEB_FILE_URL placeholder replaced with: {deb_url}")
@@ -60,8 +100,33 @@ def create_test_installer():
 
 # -------------------- Simulation Harness --------------------
 
-def _load_module_from_path(module_path):
-    """Dynamically load a module from a file path without executing __main__."""
+# Synthetic dpkg output replayed by the fake streaming command
+_SYNTHETIC_LINES = (
+    "Preparing to unpack ...",
+    "Unpacking kamiwaza (test) ...",
+    "Setting up kamiwaza (test) ...",
+    "Processing triggers for ...",
+    "Install complete",
+)
+_SYNTHETIC_BLOB = "\n".join(_SYNTHETIC_LINES)
+
+# Canned (exit code, stdout, stderr) results for the fake run_command
+_PREFIX_RESPONSES = {
+    ('wsl', '--version'): (0, "WSL version: 2.0.0", ""),
+    ('wsl', '--list', '--quiet'): (0, "Ubuntu-24.04\nkamiwaza\n", ""),
+}
+_WHICH_RESPONSE = (0, "/usr/bin/file", "")
+_EMPTY_RESPONSE = (0, "", "")
+_OK_RESPONSE = (0, "ok", "")
+_EMPTY_OUTPUT_WORDS = ('tail', 'cat', 'grep')
+
+@functools.lru_cache(maxsize=8)
+def _load_module_from_path(module_path, mtime_ns):
+    """Dynamically load a module from a file path without executing __main__.
+
+    Cached per (path, mtime_ns) so the module body runs once per file version.
+    """
+    import importlib.util  # Only needed for --simulate
     spec = importlib.util.spec_from_file_location("kamiwaza_installer_test_mod", module_path)
     if spec is None or spec.loader is None:
         raise RuntimeError(f"Cannot load module from path: {module_path}")
@@ -69,76 +134,80 @@ def _load_module_from_path(module_path):
     spec.loader.exec_module(mod)
     return mod
 
+def _fake_run_command(logs, command, timeout=None):
+    logs["run_command_calls"] += 1
+    # Simulate a few special cases for better realism
+    key = tuple(command[:3])
+    response = _PREFIX_RESPONSES.get(key) or _PREFIX_RESPONSES.get(key[:2])
+    if response:
+        return response
+    if 'which' in command:
+        return _WHICH_RESPONSE
+    cmd_str = " ".join(command)
+    if any(word in cmd_str for word in _EMPTY_OUTPUT_WORDS):
+        return _EMPTY_RESPONSE
+    # General success (wsl commands included)
+    return _OK_RESPONSE
+
+def _fake_run_command_with_streaming(installer, logs, command, timeout=None, progress_callback=None):
+    logs["streaming_calls"] += 1
+    # Emit a few synthetic lines to drive progress
+    for line in _SYNTHETIC_LINES:
+        if progress_callback:
+            progress_callback(line)
+        # Also mimic installer logging side-effect
+        installer.log_output(f"  INSTALL: {line}")
+    return 0, _SYNTHETIC_BLOB, ""
+
+def _fake_check_wsl_prerequisites():
+    return True
+
+def _fake_get_wsl_distribution():
+    return ['wsl', '-d', 'kamiwaza']
+
+def _fake_true(*args, **kwargs):
+    return True
+
+def _fake_noop(*args, **kwargs):
+    return None
+
+@functools.lru_cache(maxsize=4)
+def _make_patched(mod, memory, email, license_key, usage_reporting, mode):
+    """Build one installer instance with the side-effect-free fakes applied.
+    Serves as the prototype that each simulation run clones.
+    """
+    installer = mod.HeadlessKamiwazaInstaller(memory=memory, version="test", codename="noble", build="1", arch="amd64",
+                                              user_email=email, license_key=license_key, usage_reporting=usage_reporting, install_mode=mode)
+
+    # Monkey-patch methods to avoid real side effects
+    installer.check_wsl_prerequisites = _fake_check_wsl_prerequisites
+    installer.get_wsl_distribution = _fake_get_wsl_distribution
+    installer.configure_wsl_memory = _fake_true
+    installer.configure_debconf = _fake_noop
+    installer.configure_swap_space = _fake_noop
+    installer.disable_ipv6_wsl = _fake_noop
+    installer.download_gpu_drivers = _fake_noop
+    installer.copy_logs_to_windows = _fake_noop
+    installer.verify_and_show_logs = _fake_noop
+    return installer
+
 def _install_with_simulation(mod, memory="8GB", email="test@example.com", license_key=None, usage_reporting="1", mode="lite"):
     """Run the installer with simulated external commands and environment.
     Returns (exit_code, log_summary_dict).
     """
     logs = {"run_command_calls": 0, "streaming_calls": 0}
 
-    # Create installer instance
-    installer = mod.HeadlessKamiwazaInstaller(memory=memory, version="test", codename="noble", build="1", arch="amd64",
-                                              user_email=email, license_key=license_key, usage_reporting=usage_reporting, install_mode=mode)
-
-    # Monkey-patch methods to avoid real side effects
-    def fake_run_command(command, timeout=None):
-        logs["run_command_calls"] += 1
-        cmd_str = " ".join(command)
-        # Simulate a few special cases for better realism
-        if command[:2] == ['wsl', '--version']:
-            return 0, "WSL version: 2.0.0", ""
-        if command[:3] == ['wsl', '--list', '--quiet']:
-            return 0, "Ubuntu-24.04\nkamiwaza\n", ""
-        if 'which' in command:
-            return 0, "/usr/bin/file", ""
-        if 'tail' in cmd_str or 'cat' in cmd_str or 'grep' in cmd_str:
-            return 0, "", ""
-        if 'wsl' in command:
-            return 0, "ok", ""
-        # General success
-        return 0, "ok", ""
-
-    def fake_run_command_with_streaming(command, timeout=None, progress_callback=None):
-        logs["streaming_calls"] += 1
-        # Emit a few synthetic lines to drive progress
-        synthetic = [
-            "Preparing to unpack ...",
-            "Unpacking kamiwaza (test) ...",
-            "Setting up kamiwaza (test) ...",
-            "Processing triggers for ...",
-            "Install complete"
-        ]
-        for line in synthetic:
-            if progress_callback:
-                progress_callback(line)
-            # Also mimic installer logging side-effect
-            installer.log_output(f"  INSTALL: {line}")
-            time.sleep(0.01)
-        return 0, "\n".join(synthetic), ""
-
-    def fake_check_wsl_prerequisites():
-        return True
-
-    def fake_get_wsl_distribution():
-        return ['wsl', '-d', 'kamiwaza']
-
-    def fake_true(*args, **kwargs):
-        return True
-
-    def fake_noop(*args, **kwargs):
-        return None
+    # Shallow clone of the patched prototype; containers are copied so one
+    # run cannot leak state into the next
+    base = _make_patched(mod, memory, email, license_key, usage_reporting, mode)
+    installer = copy.copy(base)
+    for name, value in vars(base).items():
+        if isinstance(value, (dict, list, set)):
+            setattr(installer, name, copy.copy(value))
 
-    # Apply patches
-    installer.run_command = fake_run_command
-    installer.run_command_with_streaming = fake_run_command_with_streaming
-    installer.check_wsl_prerequisites = fake_check_wsl_prerequisites
-    installer.get_wsl_distribution = fake_get_wsl_distribution
-    installer.configure_wsl_memory = fake_true
-    installer.configure_debconf = fake_noop
-    installer.configure_swap_space = fake_noop
-    installer.disable_ipv6_wsl = fake_noop
-    installer.download_gpu_drivers = fake_noop
-    installer.copy_logs_to_windows = fake_noop
-    installer.verify_and_show_logs = fake_noop
+    # Fakes that record into this run's logs
+    installer.run_command = functools.partial(_fake_run_command, logs)
+    installer.run_command_with_streaming = functools.partial(_fake_run_command_with_streaming, installer, logs)
 
     # Run install with simulation
     exit_code = installer.install()
@@ -156,7 +225,7 @@ def simulate_msi_prompt(exit_code, accept_reboot=True):
 
 def run_repeatability_simulation(installer_path, repeats=2, accept_reboot=True):
     """Run the simulated installer multiple times to validate repeatability and reboot behavior."""
-    mod = _load_module_from_path(installer_path)
+    mod = _load_module_from_path(installer_path, os.stat(installer_path).st_mtime_ns)
     results = []
     for i in range(repeats):
         print(f"\n=== SIMULATION RUN {i+1}/{repeats} ===")
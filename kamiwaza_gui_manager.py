@@ -20,6 +20,7 @@ import sys
 import threading
 import json
 import datetime
+from collections import deque
 from pathlib import Path
 import webbrowser
 import time
@@ -27,7 +28,9 @@ import pystray
 from PIL import Image, ImageDraw
 import psutil
 import tempfile
+import queue
 import atexit
+import functools
 import sv_ttk
 try:
     import pywinstyles
@@ -35,6 +38,57 @@ try:
 except ImportError:
     PYWINSTYLES_AVAILABLE = False
 
+# One WSL roundtrip for the process/port checks: prints key=count lines for the
+# processes and :port lines for the listening ports. The [x] bracket patterns
+# keep pgrep from matching this bash -lc command line itself.
+PROCESS_PROBE_SCRIPT = (
+    "echo daemon=$(pgrep -cf '[k]amiwazad.py'); "
+    "echo main=$(pgrep -cf '[m]ain.py'); "
+    "echo frontend=$(pgrep -cf '[k]amiwaza-frontend'); "
+    "echo ray=$(pgrep -cf '[r]ay::'); "
+    "{ ss -tlnH 2>/dev/null || netstat -tln 2>/dev/null; } "
+    "| awk '{print $4}' | grep -Eo ':(443|7777|8265)$' | sort -u"
+)
+PROBE_PORTS = {':443': 'https', ':7777': 'api', ':8265': 'ray_dashboard'}
+
+# Status summary rows: (results key, label, text when OK, text when not)
+CHECKS = (
+    ('daemon', 'Daemon', 'Running', 'Not Running'),
+    ('main', 'Main Application', 'Running', 'Not Running'),
+    ('frontend', 'Frontend', 'Running', 'Not Running'),
+    ('ray', 'Ray Processes', 'Running', 'Not Running'),
+    ('https', 'HTTPS (443)', 'Listening', 'Not Listening'),
+    ('api', 'API (7777)', 'Listening', 'Not Listening'),
+    ('ray_dashboard', 'Ray Dashboard (8265)', 'Listening', 'Not Listening'),
+)
+
+# Seconds a WSL distribution list / GPU detection run is reused before wsl.exe is launched again
+WSL_LIST_TTL = 30
+GPU_DETECTION_TTL = 10
+
+# Log lines are buffered and appended to the output area at most once per LOG_FLUSH_MS;
+# the widget keeps the last LOG_MAX_LINES lines
+LOG_FLUSH_MS = 50
+LOG_MAX_LINES = 5000
+
+def ttl_cache(seconds):
+    """Memoize a KamiwazaManager method for `seconds` in self._ttl_cache.
+    Pass force=True to bypass; None results are not cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, force=False):
+            key = (func.__name__,) + args
+            hit = self._ttl_cache.get(key)
+            if not force and hit and time.monotonic() - hit[0] < seconds:
+                return hit[1]
+            value = func(self, *args)
+            if value is not None:
+                self._ttl_cache[key] = (time.monotonic(), value)
+            return value
+        return wrapper
+    return decorator
+
 class SingleInstance:
     """Ensure only one instance of the application runs - Windows-specific implementation"""
     
@@ -126,7 +180,13 @@ class KamiwazaManager:
         self.is_running = False
         self.output_text = None
         self.all_buttons = []
-        self._busy_count = 0
+        self._busy = False
+        self._jobq = queue.Queue()  # Actions run one at a time, in order, by _worker
+        self._log_buf = deque()  # (formatted line, level) waiting for _flush_log
+        self._log_lock = threading.Lock()
+        self._flush_pending = False
+        self._ttl_cache = {}  # (name, *args) -> (monotonic timestamp, value)
+        self._last_gpu_detection = None  # Monotonic start time of the last run_gpu_detection
         
         # UI variables (may be None in tray-only mode)
         self.dist_var = None
@@ -160,6 +220,9 @@ class KamiwazaManager:
         
         self.find_script = find_script
         
+        # Single long-lived worker thread for every button/tray action
+        threading.Thread(target=self._worker, daemon=True).start()
+        
         # Only setup full UI if not in tray-only mode
         if not tray_only_mode:
             self.setup_full_ui()
@@ -258,7 +321,7 @@ class KamiwazaManager:
         self.dist_combo = ttk.Combobox(dist_frame, textvariable=self.dist_var, width=24, state="readonly", values=[])
         self.dist_combo.grid(row=0, column=1, padx=(0, 10))
         
-        btn_detect = ttk.Button(dist_frame, text="Detect", command=self.detect_wsl_distribution)
+        btn_detect = ttk.Button(dist_frame, text="Detect", command=lambda: self.detect_wsl_distribution(force=True))
         btn_detect.grid(row=0, column=2, padx=(0, 10))
         self.all_buttons.append(btn_detect)
         
@@ -339,7 +402,7 @@ class KamiwazaManager:
         gpu_frame = ttk.LabelFrame(tab_advanced, text="GPU & WSL", padding="10", style="Card.TLabelframe")
         gpu_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        btn_gpu_detect = ttk.Button(gpu_frame, text="GPU Detection & Status", command=self.run_gpu_detection)
+        btn_gpu_detect = ttk.Button(gpu_frame, text="GPU Detection & Status", command=lambda: self.run_gpu_detection(force=True))
         btn_gpu_detect.grid(row=0, column=0, padx=6, pady=6, sticky=(tk.W, tk.E))
         self.all_buttons.append(btn_gpu_detect)
         
@@ -519,52 +582,75 @@ class KamiwazaManager:
 
     def switch_to_logs_tab(self):
         """Switch to the logs tab to monitor results"""
+        if threading.current_thread() is not threading.main_thread():
+            self.root.after(0, self.switch_to_logs_tab)
+            return
         if self.notebook:
             try:
                 self.notebook.select(2)  # Select the logs tab (index 2)
             except Exception:
                 pass
 
-    def _enter_busy(self, message):
-        self._busy_count += 1
-        if self._busy_count == 1:
-            if self.status_var:
-                self.status_var.set(message)
-            if self.progress:
-                self.progress.start(12)
-            for b in self.all_buttons:
-                try:
-                    b.configure(state=tk.DISABLED)
-                except Exception:
-                    pass
+    def submit(self, job):
+        """Queue an action for the worker thread"""
+        self._jobq.put(job)
+        self.root.after(0, self._refresh_busy)
 
-    def _leave_busy(self):
-        if self._busy_count > 0:
-            self._busy_count -= 1
-        if self._busy_count == 0:
-            if self.status_var:
-                self.status_var.set("Ready")
-            if self.progress:
-                try:
+    def _worker(self):
+        """Run queued actions one at a time so they never overlap"""
+        while True:
+            job = self._jobq.get()
+            try:
+                job()
+            except Exception as e:
+                self.log_output(f"Action failed: {e}", level="ERROR")
+            finally:
+                self._jobq.task_done()
+                self.root.after(0, self._refresh_busy)
+
+    def _refresh_busy(self):
+        """Sync status bar, progress bar and buttons with the job queue (Tk thread).
+        Busy means an action is queued or running.
+        """
+        busy = self._jobq.unfinished_tasks > 0
+        if busy == self._busy:
+            return
+        self._busy = busy
+        if self.status_var:
+            self.status_var.set("Working..." if busy else "Ready")
+        if self.progress:
+            try:
+                if busy:
+                    self.progress.start(12)
+                else:
                     self.progress.stop()
-                except Exception:
-                    pass
-            for b in self.all_buttons:
-                try:
-                    b.configure(state=tk.NORMAL)
-                except Exception:
-                    pass
-            # Update web navigation button states
-            self.update_web_button_states()
+            except Exception:
+                pass
+        for b in self.all_buttons:
+            try:
+                b.configure(state=tk.DISABLED if busy else tk.NORMAL)
+            except Exception:
+                pass
+
+    def _set_status(self, message):
+        """Show a status bar message (safe to call from the worker thread)"""
+        if self.status_var:
+            self.root.after(0, self.status_var.set, message)
 
-    def update_web_button_states(self):
-        """Update the state of web navigation buttons based on Kamiwaza running status"""
+    def update_web_button_states(self, is_running=None):
+        """Update the state of web navigation buttons based on Kamiwaza running status.
+        Pass is_running when the caller has just checked it, to skip another WSL call.
+        """
         if not self.btn_go_ui or not self.btn_go_api:
             return  # Skip if buttons don't exist (tray-only mode)
         
         # Check if Kamiwaza is running (silently)
-        is_running = self.run_wsl_command_silent(['kamiwaza', 'status'])
-        
+        if is_running is None:
+            is_running = self.run_wsl_command_silent(['kamiwaza', 'status'])
+        self.root.after(0, self._apply_web_button_states, is_running)
+
+    def _apply_web_button_states(self, is_running):
+        """Enable or disable the web navigation buttons (Tk thread)"""
         try:
             if is_running:
                 self.btn_go_ui.configure(state=tk.NORMAL, text="Go to UI", style="Accent.TButton")
@@ -576,45 +662,93 @@ class KamiwazaManager:
             pass  # Ignore errors if buttons are not available
 
     def log_output(self, message, level="INFO"):
-        """Add message to output area with timestamp and color tags"""
+        """Add message to output area with timestamp and color tags (safe from any thread)"""
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         formatted_message = f"[{timestamp}] [{level}] {message}\n"
+        self._log_buf.append((formatted_message, level))
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Arrange a single _flush_log call for everything buffered so far"""
+        with self._log_lock:
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        self.root.after(LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self):
+        """Append the buffered log lines to the output area in one insert (Tk thread)"""
+        with self._log_lock:
+            self._flush_pending = False
+        # Consecutive lines with the same level share one (text, tag) chunk
+        chunks = []
+        while self._log_buf:
+            text, level = self._log_buf.popleft()
+            if chunks and chunks[-1][1] == level:
+                chunks[-1][0].append(text)
+            else:
+                chunks.append(([text], level))
+        if not chunks or not self.output_text:
+            return
         
-        if self.output_text:
-            try:
-                self.output_text.insert(tk.END, formatted_message, (level,))
-            except Exception:
-                self.output_text.insert(tk.END, formatted_message)
-            self.output_text.see(tk.END)
-            self.root.update_idletasks()
+        args = []
+        for lines, level in chunks:
+            args.extend(("".join(lines), (level,)))
+        try:
+            self.output_text.insert(tk.END, *args)
+        except Exception:
+            self.output_text.insert(tk.END, "".join(args[::2]))
+        # Keep the widget bounded; a no-op while it has fewer lines
+        self.output_text.delete("1.0", f"end - {LOG_MAX_LINES} lines")
+        self.output_text.see(tk.END)
+
+    def _stream_lines(self, pipe, level):
+        """Forward non-empty lines from a pipe to the log on the Tk thread"""
+        try:
+            for line in pipe:
+                line = line.rstrip()
+                if line.strip():
+                    self.log_output(line, level=level)
+        except Exception:
+            pass
+        finally:
+            pipe.close()
 
     def run_command(self, command, description, timeout=60):
-        """Run a command and display output"""
-        self._enter_busy(f"Running: {description}")
+        """Run a command and stream its output to the log as it arrives"""
+        self._set_status(f"Running: {description}")
         self.log_output(f"Running: {description}", level="INFO")
         self.log_output(f"Command: {' '.join(command)}", level="CMD")
         
         try:
             # Use utf-8 encoding to avoid Unicode decode errors
             kwargs = self._get_subprocess_kwargs(visible=False)
-            result = subprocess.run(command, capture_output=True, text=True, timeout=timeout, encoding='utf-8', errors='replace', **kwargs)
-            
-            if result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if line.strip():
-                        self.log_output(line, level="INFO")
-            
-            if result.stderr:
-                for line in result.stderr.strip().split('\n'):
-                    if line.strip():
-                        self.log_output(line, level="WARN")
+            proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                    encoding='utf-8', errors='replace', bufsize=1, **kwargs)
+            readers = [
+                threading.Thread(target=self._stream_lines, args=(proc.stdout, "INFO"), daemon=True),
+                threading.Thread(target=self._stream_lines, args=(proc.stderr, "WARN"), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
             
-            if result.returncode == 0:
+            try:
+                returncode = proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
+            finally:
+                # Grandchildren (e.g. under wsl.exe) may hold the pipes open; don't wait on them forever
+                for reader in readers:
+                    reader.join(timeout=5)
+            
+            if returncode == 0:
                 self.log_output(f"{description} completed successfully", level="SUCCESS")
             else:
-                self.log_output(f"{description} failed with exit code {result.returncode}", level="ERROR")
+                self.log_output(f"{description} failed with exit code {returncode}", level="ERROR")
             
-            return result.returncode == 0
+            return returncode == 0
             
         except subprocess.TimeoutExpired:
             self.log_output(f"{description} timed out after {timeout} seconds", level="ERROR")
@@ -622,8 +756,6 @@ class KamiwazaManager:
         except Exception as e:
             self.log_output(f"{description} failed with error: {e}", level="ERROR")
             return False
-        finally:
-            self._leave_busy()
 
     def run_wsl_command(self, command, description, timeout=60):
         """Run a WSL command with proper encoding handling"""
@@ -700,7 +832,6 @@ class KamiwazaManager:
         if not clean_dist or len(clean_dist) < 2:
             self.log_output("Invalid WSL distribution name", level="ERROR")
             return
-        self._enter_busy("Opening WSL terminal")
         try:
             # Prefer Windows Terminal if available
             try:
@@ -714,32 +845,35 @@ class KamiwazaManager:
                 self.log_output("Opened PowerShell for WSL", level="SUCCESS")
         except Exception as e:
             self.log_output(f"Failed to open WSL terminal: {e}", level="ERROR")
-        finally:
-            self._leave_busy()
 
-    def detect_wsl_distribution(self):
-        """Auto-detect available WSL distributions"""
+    @ttl_cache(WSL_LIST_TTL)
+    def _list_distributions(self):
+        """Return the names from `wsl --list --quiet`, or None if the command fails"""
+        result = subprocess.run(['wsl', '--list', '--quiet'], 
+                              capture_output=True, text=True, timeout=30, encoding='utf-8', errors='replace')
+        if result.returncode != 0:
+            return None
+        
+        # Remove null characters and normalize line endings
+        cleaned_output = result.stdout.replace('\x00', '').replace('\r\n', '\n').replace('\r', '\n')
+        
+        # Split into lines and clean each line
+        distributions = []
+        for line in cleaned_output.strip().split('\n'):
+            clean_line = line.strip()
+            if clean_line and clean_line not in ['', ' ']:
+                distributions.append(clean_line)
+        return distributions
+
+    def detect_wsl_distribution(self, force=False):
+        """Auto-detect available WSL distributions (list reused for WSL_LIST_TTL unless force)"""
         self.log_output("Detecting available WSL distributions...", level="INFO")
         
         try:
             # Method 1: Try --list --quiet
-            result = subprocess.run(['wsl', '--list', '--quiet'], 
-                                  capture_output=True, text=True, timeout=30, encoding='utf-8', errors='replace')
+            distributions = self._list_distributions(force=force)
             
-            if result.returncode == 0:
-                # Clean up the output - remove null characters and normalize
-                raw_output = result.stdout
-                
-                # Remove null characters and normalize line endings
-                cleaned_output = raw_output.replace('\x00', '').replace('\r\n', '\n').replace('\r', '\n')
-                
-                # Split into lines and clean each line
-                distributions = []
-                for line in cleaned_output.strip().split('\n'):
-                    clean_line = line.strip()
-                    if clean_line and clean_line not in ['', ' ']:
-                        distributions.append(clean_line)
-                
+            if distributions is not None:
                 self.log_output(f"Found WSL distributions: {distributions}", level="INFO")
                 
                 # Prefer kamiwaza, then Ubuntu-24.04, then first available
@@ -840,12 +974,12 @@ class KamiwazaManager:
             if self.dist_var:
                 self.dist_var.set(self.wsl_distribution)
 
-    def refresh_all(self):
+    def refresh_all(self, force=False):
         """Refresh all status information"""
         self.log_output("Refreshing all status information...", level="INFO")
-        self.detect_wsl_distribution()
+        self.detect_wsl_distribution(force=force)
         self.check_kamiwaza_status()
-        self.run_gpu_detection()  # Combined GPU detection and status
+        self.run_gpu_detection(force=force)  # Combined GPU detection and status
         self.log_output("Refresh completed", level="SUCCESS")
 
     # === KAMIWAZA CONTROL FUNCTIONS ===
@@ -876,7 +1010,7 @@ class KamiwazaManager:
             # Update web button states after start operation
             self.update_web_button_states()
         
-        threading.Thread(target=start_thread, daemon=True).start()
+        self.submit(start_thread)
 
     def stop_kamiwaza(self):
         """Stop Kamiwaza service"""
@@ -909,7 +1043,7 @@ class KamiwazaManager:
             # Update web button states after stop operation
             self.update_web_button_states()
         
-        threading.Thread(target=stop_thread, daemon=True).start()
+        self.submit(stop_thread)
 
     def check_kamiwaza_status(self):
         """Check Kamiwaza service status"""
@@ -923,14 +1057,13 @@ class KamiwazaManager:
             
             self.switch_to_logs_tab()
             self.log_output("Getting status...", level="INFO")
-            self.run_wsl_command(['kamiwaza', 'status'], "Checking Kamiwaza status")
+            is_running = self.run_wsl_command(['kamiwaza', 'status'], "Checking Kamiwaza status")
             
             # Check key Kamiwaza processes with better formatting
             self.check_kamiwaza_processes()
             
-            # Update tray icon title based on actual status
+            # Update tray icon title based on the status check above
             if self.tray_icon:
-                is_running = self.run_wsl_command_silent(['kamiwaza', 'status'])
                 if is_running:
                     self.tray_icon.title = "Kamiwaza Manager - Running"
                 else:
@@ -939,121 +1072,104 @@ class KamiwazaManager:
             # Clear operation in progress flag
             self.operation_in_progress = False
             # Update web button states after status check
-            self.update_web_button_states()
+            self.update_web_button_states(is_running)
         
-        threading.Thread(target=status_thread, daemon=True).start()
+        self.submit(status_thread)
+
+    def _probe_kamiwaza_processes(self, timeout=15):
+        """Run PROCESS_PROBE_SCRIPT in one WSL call and return {check: bool}"""
+        results = dict.fromkeys((key for key, *_ in CHECKS), False)
+        clean_dist = self.wsl_distribution.strip()
+        if not clean_dist or len(clean_dist) < 2:
+            return results
+        try:
+            wsl_cmd = ['wsl', '-d', clean_dist, '--', 'bash', '-lc', PROCESS_PROBE_SCRIPT]
+            kwargs = self._get_subprocess_kwargs(visible=False)
+            result = subprocess.run(wsl_cmd, capture_output=True, text=True, timeout=timeout, encoding='utf-8', errors='replace', **kwargs)
+        except Exception:
+            return results
+        for line in result.stdout.splitlines():
+            line = line.strip()
+            if line in PROBE_PORTS:
+                results[PROBE_PORTS[line]] = True
+            elif '=' in line:
+                key, _, count = line.partition('=')
+                if key in results:
+                    results[key] = count.isdigit() and int(count) > 0
+        return results
 
     def check_kamiwaza_processes(self):
-        """Check Kamiwaza processes with better formatting"""
-        def process_thread():
-            self.log_output("=== KAMIWAZA PROCESS STATUS ===", level="INFO")
-            
-            # Track results for accurate summary
-            results = {}
-            
-            # Check main Kamiwaza daemon
-            daemon_result = self.run_wsl_command_silent(['pgrep', '-f', 'kamiwazad.py'])
-            results['daemon'] = daemon_result
-            if daemon_result:
-                self.log_output("[OK] Daemon process found", level="SUCCESS")
-            else:
-                self.log_output("✗ Daemon process not found", level="ERROR")
-            
-            # Check main Kamiwaza application
-            main_result = self.run_wsl_command_silent(['pgrep', '-f', 'main.py'])
-            results['main'] = main_result
-            if main_result:
-                self.log_output("[OK] Main application processes found", level="SUCCESS")
-            else:
-                self.log_output("✗ Main application processes not found", level="ERROR")
-            
-            # Check frontend processes
-            frontend_result = self.run_wsl_command_silent(['pgrep', '-f', 'kamiwaza-frontend'])
-            results['frontend'] = frontend_result
-            if frontend_result:
-                self.log_output("[OK] Frontend processes found", level="SUCCESS")
-            else:
-                self.log_output("✗ Frontend processes not found", level="ERROR")
-            
-            # Check Ray processes
-            ray_result = self.run_wsl_command_silent(['pgrep', '-f', 'ray::'])
-            results['ray'] = ray_result
-            if ray_result:
-                self.log_output("[OK] Ray processes found", level="SUCCESS")
-            else:
-                self.log_output("✗ Ray processes not found", level="ERROR")
-            
-            # Show a summary of key processes
-            self.run_wsl_command(['ps', 'h', '-o', 'pid,ppid,cmd', '-C', 'python'], "Python processes summary")
-            
-            # Check if specific ports are listening (via shell so pipes work)
-            https_result = self.run_wsl_shell_command_silent('netstat -tlnp 2>/dev/null | grep :443')
-            results['https'] = https_result
-            if https_result:
-                self.log_output("[OK] HTTPS port (443) is listening", level="SUCCESS")
-            else:
-                self.log_output("✗ HTTPS port (443) not listening", level="ERROR")
-            
-            api_result = self.run_wsl_shell_command_silent('netstat -tlnp 2>/dev/null | grep :7777')
-            results['api'] = api_result
-            if api_result:
-                self.log_output("[OK] API port (7777) is listening", level="SUCCESS")
-            else:
-                self.log_output("✗ API port (7777) not listening", level="ERROR")
-            
-            ray_dashboard_result = self.run_wsl_shell_command_silent('netstat -tlnp 2>/dev/null | grep :8265')
-            results['ray_dashboard'] = ray_dashboard_result
-            if ray_dashboard_result:
-                self.log_output("[OK] Ray dashboard port (8265) is listening", level="SUCCESS")
-            else:
-                self.log_output("✗ Ray dashboard port (8265) not listening", level="ERROR")
-            
-            # Generate accurate summary based on actual results
-            self.log_output("=== SUMMARY ===", level="INFO")
-            
-            # Count successes and failures
-            total_checks = len(results)
-            successful_checks = sum(1 for result in results.values() if result)
-            failed_checks = total_checks - successful_checks
-            
-            # Show individual results
-            status_symbols = {
-                'daemon': '[OK]' if results['daemon'] else '✗',
-                'main': '[OK]' if results['main'] else '✗', 
-                'frontend': '[OK]' if results['frontend'] else '✗',
-                'ray': '[OK]' if results['ray'] else '✗',
-                'https': '[OK]' if results['https'] else '✗',
-                'api': '[OK]' if results['api'] else '✗',
-                'ray_dashboard': '[OK]' if results['ray_dashboard'] else '✗'
-            }
-            
-            status_levels = {
-                'daemon': 'SUCCESS' if results['daemon'] else 'ERROR',
-                'main': 'SUCCESS' if results['main'] else 'ERROR',
-                'frontend': 'SUCCESS' if results['frontend'] else 'ERROR',
-                'ray': 'SUCCESS' if results['ray'] else 'ERROR',
-                'https': 'SUCCESS' if results['https'] else 'ERROR',
-                'api': 'SUCCESS' if results['api'] else 'ERROR',
-                'ray_dashboard': 'SUCCESS' if results['ray_dashboard'] else 'ERROR'
-            }
-            
-            self.log_output(f"{status_symbols['daemon']} Daemon: {'Running' if results['daemon'] else 'Not Running'}", level=status_levels['daemon'])
-            self.log_output(f"{status_symbols['main']} Main Application: {'Running' if results['main'] else 'Not Running'}", level=status_levels['main'])
-            self.log_output(f"{status_symbols['frontend']} Frontend: {'Running' if results['frontend'] else 'Not Running'}", level=status_levels['frontend'])
-            self.log_output(f"{status_symbols['ray']} Ray Processes: {'Running' if results['ray'] else 'Not Running'}", level=status_levels['ray'])
-            self.log_output(f"{status_symbols['https']} HTTPS (443): {'Listening' if results['https'] else 'Not Listening'}", level=status_levels['https'])
-            self.log_output(f"{status_symbols['api']} API (7777): {'Listening' if results['api'] else 'Not Listening'}", level=status_levels['api'])
-            self.log_output(f"{status_symbols['ray_dashboard']} Ray Dashboard (8265): {'Listening' if results['ray_dashboard'] else 'Not Listening'}", level=status_levels['ray_dashboard'])
-            
-            # Overall status
-            if failed_checks == 0:
-                self.log_output(f"All systems operational! ({successful_checks}/{total_checks} checks passed)", level="SUCCESS")
-            elif successful_checks == 0:
-                self.log_output(f"All systems down! ({failed_checks}/{total_checks} checks failed)", level="ERROR")
+        """Check Kamiwaza processes with better formatting (runs on the worker thread)"""
+        self.log_output("=== KAMIWAZA PROCESS STATUS ===", level="INFO")
+        
+        # Track results for accurate summary
+        results = self._probe_kamiwaza_processes()
+        
+        # Check main Kamiwaza daemon
+        if results['daemon']:
+            self.log_output("[OK] Daemon process found", level="SUCCESS")
+        else:
+            self.log_output("✗ Daemon process not found", level="ERROR")
+        
+        # Check main Kamiwaza application
+        if results['main']:
+            self.log_output("[OK] Main application processes found", level="SUCCESS")
+        else:
+            self.log_output("✗ Main application processes not found", level="ERROR")
+        
+        # Check frontend processes
+        if results['frontend']:
+            self.log_output("[OK] Frontend processes found", level="SUCCESS")
+        else:
+            self.log_output("✗ Frontend processes not found", level="ERROR")
+        
+        # Check Ray processes
+        if results['ray']:
+            self.log_output("[OK] Ray processes found", level="SUCCESS")
+        else:
+            self.log_output("✗ Ray processes not found", level="ERROR")
+        
+        # Show a summary of key processes
+        self.run_wsl_command(['ps', 'h', '-o', 'pid,ppid,cmd', '-C', 'python'], "Python processes summary")
+        
+        # Check if specific ports are listening
+        if results['https']:
+            self.log_output("[OK] HTTPS port (443) is listening", level="SUCCESS")
+        else:
+            self.log_output("✗ HTTPS port (443) not listening", level="ERROR")
+        
+        if results['api']:
+            self.log_output("[OK] API port (7777) is listening", level="SUCCESS")
+        else:
+            self.log_output("✗ API port (7777) not listening", level="ERROR")
+        
+        if results['ray_dashboard']:
+            self.log_output("[OK] Ray dashboard port (8265) is listening", level="SUCCESS")
+        else:
+            self.log_output("✗ Ray dashboard port (8265) not listening", level="ERROR")
+        
+        # Generate accurate summary based on actual results
+        self.log_output("=== SUMMARY ===", level="INFO")
+        
+        # Count successes and failures
+        total_checks = len(results)
+        successful_checks = sum(results.values())
+        failed_checks = total_checks - successful_checks
+        
+        # Show individual results
+        for key, label, ok_text, bad_text in CHECKS:
+            if results[key]:
+                self.log_output(f"[OK] {label}: {ok_text}", level="SUCCESS")
             else:
-                self.log_output(f"System partially operational ({successful_checks}/{total_checks} checks passed, {failed_checks} failed)", level="WARN")
+                self.log_output(f"✗ {label}: {bad_text}", level="ERROR")
         
-        threading.Thread(target=process_thread, daemon=True).start()
+        # Overall status
+        if failed_checks == 0:
+            self.log_output(f"All systems operational! ({successful_checks}/{total_checks} checks passed)", level="SUCCESS")
+        elif successful_checks == 0:
+            self.log_output(f"All systems down! ({failed_checks}/{total_checks} checks failed)", level="ERROR")
+        else:
+            self.log_output(f"System partially operational ({successful_checks}/{total_checks} checks passed, {failed_checks} failed)", level="WARN")
 
     def view_kamiwaza_logs(self):
         """Open Kamiwaza logs folder in AppData"""
@@ -1079,8 +1195,13 @@ class KamiwazaManager:
 
     # === GPU MANAGEMENT FUNCTIONS ===
     
-    def run_gpu_detection(self):
-        """Run GPU detection and show status"""
+    def run_gpu_detection(self, force=False):
+        """Run GPU detection and show status (skipped within GPU_DETECTION_TTL of the last run unless force)"""
+        now = time.monotonic()
+        if not force and self._last_gpu_detection is not None and now - self._last_gpu_detection < GPU_DETECTION_TTL:
+            return
+        self._last_gpu_detection = now
+        
         def gpu_thread():
             self.switch_to_logs_tab()
             self.log_output("Running GPU detection and status check...", level="INFO")
@@ -1106,24 +1227,21 @@ class KamiwazaManager:
                 # Also check GPU status
                 self.check_gpu_status()
         
-        threading.Thread(target=gpu_thread, daemon=True).start()
+        self.submit(gpu_thread)
 
     def check_gpu_status(self):
-        """Check GPU status and available acceleration"""
-        def gpu_status_thread():
-            # Check GPU status script if available
-            self.run_wsl_command(['/usr/local/bin/kamiwaza_gpu_status.sh'], "GPU status check")
-            
-            # Check for OpenCL
-            self.run_wsl_command(['clinfo', '--list'], "OpenCL platform detection")
-            
-            # Check for NVIDIA tools
-            self.run_wsl_command(['which', 'nvidia-smi'], "NVIDIA driver check")
-            
-            # Check for Intel tools
-            self.run_wsl_command(['which', 'vainfo'], "Intel graphics driver check")
+        """Check GPU status and available acceleration (runs on the worker thread)"""
+        # Check GPU status script if available
+        self.run_wsl_command(['/usr/local/bin/kamiwaza_gpu_status.sh'], "GPU status check")
+        
+        # Check for OpenCL
+        self.run_wsl_command(['clinfo', '--list'], "OpenCL platform detection")
+        
+        # Check for NVIDIA tools
+        self.run_wsl_command(['which', 'nvidia-smi'], "NVIDIA driver check")
         
-        threading.Thread(target=gpu_status_thread, daemon=True).start()
+        # Check for Intel tools
+        self.run_wsl_command(['which', 'vainfo'], "Intel graphics driver check")
 
     # === WSL MANAGEMENT FUNCTIONS ===
     
@@ -1137,7 +1255,7 @@ class KamiwazaManager:
             # Check WSL version
             self.run_command(['wsl', '--version'], "WSL version check")
         
-        threading.Thread(target=wsl_status_thread, daemon=True).start()
+        self.submit(wsl_status_thread)
 
     def fix_wsl_issues(self):
         """Attempt to fix common WSL issues"""
@@ -1159,7 +1277,7 @@ class KamiwazaManager:
             test_cmd = ['wsl', '-d', self.wsl_distribution, '--', 'echo', 'WSL_TEST_SUCCESS']
             self.run_command(test_cmd, "Testing WSL distribution access")
         
-        threading.Thread(target=fix_thread, daemon=True).start()
+        self.submit(fix_thread)
 
     def clean_wsl(self):
         """Clean WSL environment"""
@@ -1178,10 +1296,10 @@ class KamiwazaManager:
                 else:
                     self.log_output("Cleanup script not found", level="ERROR")
                 
-                # Refresh status
-                self.refresh_all()
+                # Refresh status (the distribution list just changed)
+                self.refresh_all(force=True)
             
-            threading.Thread(target=clean_thread, daemon=True).start()
+            self.submit(clean_thread)
 
     # === SYSTEM MANAGEMENT FUNCTIONS ===
     
@@ -1209,7 +1327,7 @@ class KamiwazaManager:
             except Exception as e:
                 self.log_output(f"Could not get GPU info: {e}", level="WARN")
         
-        threading.Thread(target=info_thread, daemon=True).start()
+        self.submit(info_thread)
 
     def reinstall_kamiwaza(self):
         """Reinstall Kamiwaza"""
@@ -1234,7 +1352,7 @@ class KamiwazaManager:
                     self.log_output("Headless installer not found", level="ERROR")
                     self.log_output("Please run the installer manually", level="INFO")
             
-            threading.Thread(target=reinstall_thread, daemon=True).start()
+            self.submit(reinstall_thread)
 
     def open_appdata_folder(self):
         """Open Kamiwaza AppData folder"""
@@ -1287,6 +1405,7 @@ class KamiwazaManager:
     
     def clear_output(self):
         """Clear the output text area"""
+        self._log_buf.clear()  # Drop lines not yet flushed as well
         if self.output_text:
             self.output_text.delete(1.0, tk.END)
         self.log_output("Output cleared", level="INFO")
@@ -21,6 +21,7 @@ NOTE - DO NOT ADD UNICODE CHARACTERS TO ANY FILES IN THIS REPO.
 import subprocess
 import sys
 import os
+import re
 import platform
 import datetime
 import time
@@ -33,6 +34,14 @@ import importlib.util
 import psutil
 import winreg
 
+# `wsl --list` output is UTF-16 decoded as text: drop NULs, spaces and CRs, keep newlines as separators
+_WSL_TRANS = str.maketrans({'\x00': None, ' ': None, '\r': None, '\n': ' '})
+
+# Resolved once: gettempdir() checks environment variables and probes directories,
+# and log_output appends to the temp log on every message
+_TEMP_DIR = tempfile.gettempdir()
+_TEMP_LOG = os.path.join(_TEMP_DIR, 'kamiwaza_installer_temp.log')
+
 
 def get_ram_gb():
     return psutil.virtual_memory().total / (1024 ** 3)
@@ -1330,36 +1339,53 @@ class HeadlessKamiwazaInstaller:
     def verify_and_show_logs(self, wsl_cmd):
         """Verify actual log files exist and show summary"""
         try:
-            # Check APT terminal log
-            cmd = f"ls -la /var/log/apt/term.log"
+            # One WSL invocation for every check (each wsl.exe start costs hundreds of ms);
+            # each section follows an ===NAME=== line. STAT has one "path|type|size|mtime"
+            # line per log (or "path|MISSING"), which parses the same under any locale
+            cmd = (
+                'echo ===STAT===; for p in /var/log/apt/term.log /var/log/apt/history.log; do '
+                'stat -c "%n|%F|%s|%Y" "$p" 2>/dev/null || echo "$p|MISSING"; done; '
+                'echo ===TERM_TAIL===; tail -5 /var/log/apt/term.log 2>/dev/null; '
+                'echo ===DPKG===; grep -c kamiwaza /var/log/dpkg.log 2>/dev/null; '
+                'echo ===END==='
+            )
             ret, out, err = self.run_command(wsl_cmd + ['bash', '-c', cmd])
-            if ret == 0:
-                self.log_output(f"[OK] APT terminal log exists: {out.strip()}")
+            parts = re.split(r'^===(\w+)===$', out or '', flags=re.MULTILINE)
+            sections = {name: body.strip() for name, body in zip(parts[1::2], parts[2::2])}
+            if 'END' not in sections:
+                self.log_output(f"[WARN] Could not check installation logs: {err}")
+                return
+            
+            stats = {}
+            for line in sections['STAT'].splitlines():
+                fields = line.split('|')
+                if len(fields) == 4:
+                    path, _, size, mtime = fields
+                    modified = datetime.datetime.fromtimestamp(int(mtime)).strftime('%Y-%m-%d %H:%M:%S')
+                    stats[path] = f"{path} ({size} bytes, modified {modified})"
+            
+            # Check APT terminal log
+            if '/var/log/apt/term.log' in stats:
+                self.log_output(f"[OK] APT terminal log exists: {stats['/var/log/apt/term.log']}")
                 
                 # Show last few lines
-                cmd = f"tail -10 /var/log/apt/term.log"
-                ret, out, err = self.run_command(wsl_cmd + ['bash', '-c', cmd])
-                if ret == 0 and out:
-                    self.log_output("Last 10 lines of APT installation log:")
-                    for line in out.strip().split('\n')[-5:]:  # Show only last 5 lines to save space
+                if sections['TERM_TAIL']:
+                    self.log_output("Last 5 lines of APT installation log:")
+                    for line in sections['TERM_TAIL'].split('\n'):
                         if line.strip():
                             self.log_output(f"  {line}")
             else:
-                self.log_output(f"[WARN] APT terminal log not found: {err}")
+                self.log_output("[WARN] APT terminal log not found")
             
             # Check APT history log
-            cmd = f"ls -la /var/log/apt/history.log"
-            ret, out, err = self.run_command(wsl_cmd + ['bash', '-c', cmd])
-            if ret == 0:
-                self.log_output(f"[OK] APT history log exists: {out.strip()}")
+            if '/var/log/apt/history.log' in stats:
+                self.log_output(f"[OK] APT history log exists: {stats['/var/log/apt/history.log']}")
             else:
-                self.log_output(f"[WARN] APT history log not found: {err}")
+                self.log_output("[WARN] APT history log not found")
             
             # Check for kamiwaza in dpkg log
-            cmd = f"grep -c kamiwaza /var/log/dpkg.log"
-            ret, out, err = self.run_command(wsl_cmd + ['bash', '-c', cmd])
-            if ret == 0 and out.strip().isdigit():
-                count = int(out.strip())
+            count = sections['DPKG']
+            if count.isdigit() and int(count) > 0:
                 self.log_output(f"[OK] Found {count} kamiwaza entries in DPKG log")
             else:
                 self.log_output(f"[WARN] No kamiwaza entries found in DPKG log")
@@ -1428,8 +1454,7 @@ class HeadlessKamiwazaInstaller:
             
             # Method 5: Write to Windows temp directory (always accessible)
             try:
-                import tempfile
-                temp_log = os.path.join(tempfile.gettempdir(), 'kamiwaza_installer_temp.log')
+                temp_log = _TEMP_LOG
                 with open(temp_log, 'a', encoding='utf-8', errors='replace') as f:
                     f.write(log_line + '\n')
                     f.flush()
@@ -1610,18 +1635,19 @@ class HeadlessKamiwazaInstaller:
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             startupinfo.wShowWindow = subprocess.SW_HIDE
             
-            process = subprocess.Popen(
+            # subprocess.run kills and reaps the child itself when the timeout expires
+            result = subprocess.run(
                 command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                capture_output=True,
                 text=True,
                 encoding='utf-8',
                 env=env,
                 startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NO_WINDOW
+                creationflags=subprocess.CREATE_NO_WINDOW,
+                timeout=timeout,
+                check=False
             )
-            
-            stdout, stderr = process.communicate(timeout=timeout)
+            stdout, stderr = result.stdout, result.stderr
             # Filter noisy systemd-cat errors when journald is not available
             def _filter_noise(s):
                 if not s:
@@ -1634,10 +1660,9 @@ class HeadlessKamiwazaInstaller:
             if stderr_filtered:
                 self.log_output(f"STDERR: {stderr_filtered.strip()}")
             
-            return process.returncode, stdout, stderr
+            return result.returncode, stdout, stderr
             
         except subprocess.TimeoutExpired:
-            process.kill()
             self.log_output(f"Command timed out after {timeout} seconds")
             return 1, "", f"Command timed out after {timeout} seconds"
         except Exception as e:
@@ -1971,11 +1996,11 @@ class HeadlessKamiwazaInstaller:
                 self.log_output("=== PHASE 7: GPU DRIVER VERIFICATION (SKIPPED) ===", progress=85)
                 
                 # Show success message from backup log if available
-                log_cmd = f"tail -10 /tmp/kamiwaza_install.log 2>/dev/null || echo 'Backup log not found'"
+                log_cmd = f"tail -5 /tmp/kamiwaza_install.log 2>/dev/null || echo 'Backup log not found'"
                 log_ret, log_out, log_err = self.run_command(wsl_cmd + ['bash', '-c', log_cmd])
                 if log_ret == 0 and log_out and 'Backup log not found' not in log_out:
                     self.log_output("Last lines from backup install log:")
-                    for line in log_out.strip().split('\n')[-5:]:
+                    for line in log_out.strip().split('\n'):
                         if line.strip():
                             self.log_output(f"  LOG: {line}")
             
@@ -2037,7 +2062,7 @@ class HeadlessKamiwazaInstaller:
             # Show installer-specific log locations
             self.log_output("INSTALLER LOG LOCATIONS (this script's output):")
             self.log_output(f"  Primary installer log: {appdata_logs}\\kamiwaza_installer.log")
-            self.log_output(f"  Temporary installer log: {os.path.join(tempfile.gettempdir(), 'kamiwaza_installer_temp.log')}")
+            self.log_output(f"  Temporary installer log: {_TEMP_LOG}")
             self.log_output(f"  Simple fallback log: {os.path.join(os.getcwd(), 'kamiwaza_installer_simple.log')}")
             self.log_output("")
             
@@ -2198,8 +2223,7 @@ class HeadlessKamiwazaInstaller:
                     return None
         
         if ret == 0:
-            wsl_instances = out.replace('\x00', '').replace(' ', '').replace('\r', '').replace('\n', ' ').split()
-            wsl_instances = [name.strip() for name in wsl_instances if name.strip()]  # Remove empty entries
+            wsl_instances = out.translate(_WSL_TRANS).split()
             
             # Check ONLY for existing kamiwaza instance - no fallback to Ubuntu-24.04
             if 'kamiwaza' in wsl_instances:
@@ -2312,8 +2336,7 @@ class HeadlessKamiwazaInstaller:
             return None
         
         # Parse WSL instances (handle UTF-16 encoding with null bytes and spaces)
-        wsl_instances = out.replace('\x00', '').replace(' ', '').replace('\r', '').replace('\n', ' ').split()
-        wsl_instances = [name.strip() for name in wsl_instances if name.strip()]  # Remove empty entries
+        wsl_instances = out.translate(_WSL_TRANS).split()
         if instance_name in wsl_instances:
             self.log_output(f"Existing {instance_name} WSL instance found")
             self.log_output("Restarting WSL to ensure clean state for installation...")
@@ -2389,7 +2412,7 @@ class HeadlessKamiwazaInstaller:
         
         # Setup paths
         wsl_dir = os.path.join(os.environ.get('LOCALAPPDATA', ''), 'WSL', instance_name)
-        temp_dir = tempfile.gettempdir()
+        temp_dir = _TEMP_DIR
         rootfs_file = os.path.join(temp_dir, f'ubuntu-24.04-wsl-{os.getpid()}.rootfs.tar.gz')
         
         # Create WSL directory
@@ -2405,23 +2428,34 @@ class HeadlessKamiwazaInstaller:
         else:
             raise ValueError(f"Unsupported architecture: {self.arch}")
         
-        # Use curl to download (more reliable and shows progress)
-        download_cmd = [
-            'curl', '-L', '-o', rootfs_file, download_url,
-            '--connect-timeout', '30'
-        ]
+        # Prefer aria2c (8 parallel range connections) when installed, otherwise
+        # curl (ships with Windows 10+, more reliable than Invoke-WebRequest)
+        if shutil.which('aria2c'):
+            download_cmd = [
+                'aria2c', '-x', '8', '-s', '8', '--allow-overwrite=true',
+                '--connect-timeout=30', '--console-log-level=warn',
+                '-d', os.path.dirname(rootfs_file), '-o', os.path.basename(rootfs_file),
+                download_url
+            ]
+        else:
+            download_cmd = [
+                'curl', '-L', '-o', rootfs_file, download_url,
+                '--connect-timeout', '30'
+            ]
         ret, _, err = self.run_command(download_cmd)  # 23+ minutes for 340MB download
         
         if ret != 0:
             self.log_output(f"ERROR: Failed to download Ubuntu rootfs: {err}")
             return None
             
-        # Verify download
-        if not os.path.exists(rootfs_file):
+        # Verify download (one stat for existence and size)
+        try:
+            rootfs_size = os.stat(rootfs_file).st_size
+        except FileNotFoundError:
             self.log_output("ERROR: Downloaded rootfs file not found")
             return None
             
-        self.log_output(f"Successfully downloaded rootfs: {os.path.getsize(rootfs_file)} bytes")
+        self.log_output(f"Successfully downloaded rootfs: {rootfs_size} bytes")
         
         # Import as kamiwaza WSL instance
         self.log_output(f"Importing as '{instance_name}' WSL instance...")
@@ -2498,8 +2532,7 @@ class HeadlessKamiwazaInstaller:
             # Verify what WSL instances exist after import
             ret_check, out_check, _ = self.run_command(['wsl', '--list', '--quiet'])
             if ret_check == 0:
-                instances_after = out_check.replace('\x00', '').replace(' ', '').replace('\r', '').replace('\n', ' ').split()
-                instances_after = [name.strip() for name in instances_after if name.strip()]
+                instances_after = out_check.translate(_WSL_TRANS).split()
                 self.log_output(f"WSL instances after import: {instances_after}")
             else:
                 self.log_output("Could not list WSL instances after import")
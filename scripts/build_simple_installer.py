@@ -6,56 +6,231 @@ Creates a Windows installer without requiring WiX Toolset.
 
 import os
 import sys
+import argparse
+import hashlib
 import subprocess
 import shutil
 import zipfile
+import zlib
 import urllib.request
 import tempfile
+import threading
 from pathlib import Path
 
-def check_requirements():
-    """Check and install Python requirements."""
+# Directory containing this script (and windows_installer.py)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from _build_common import ROOT_DIR, build_lock, find_upx  # ROOT_DIR: where the spec finds manifest and icon
+
+def _discard_dir(path):
+    """Remove a directory without making the build wait for it.
+
+    The directory is renamed aside (a single cheap operation) and deleted by a
+    background thread while PyInstaller runs; stale copies left by earlier
+    interrupted runs are swept up at the same time. Falls back to a
+    synchronous delete when the rename fails (e.g. a file is locked).
+    """
+    stale = f"{path}.old-{os.getpid()}"
+    try:
+        os.replace(path, stale)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+
+    def _sweep():
+        for old in Path(path).parent.glob(Path(path).name + ".old-*"):
+            shutil.rmtree(old, ignore_errors=True)
+
+    # Non-daemon so the interpreter finishes the delete before exiting
+    threading.Thread(target=_sweep, name=f"discard-{os.path.basename(path)}").start()
+
+# PyInstaller spec holding all build options (one-dir, UPX, manifest, icon)
+SPEC_FILE = os.path.join(SCRIPT_DIR, "kamiwaza_installer.spec")
+
+# Files whose contents determine the PyInstaller analysis; when none of them
+# change, the cached Analysis/PYZ data under the work dir is reused.
+BUILD_INPUTS = [
+    os.path.join(SCRIPT_DIR, "windows_installer.py"),
+    SPEC_FILE,
+    str(ROOT_DIR / "requirements.txt"),
+    str(ROOT_DIR / "uac_admin.manifest"),
+    str(ROOT_DIR / "icon.ico"),
+]
+
+def _create_sfx(app_dir, sfx_path):
+    """Pack the one-dir build into a 7-Zip self-extracting archive, if 7-Zip is available."""
+    seven_zip = shutil.which("7z")
+    if not seven_zip:
+        print("7-Zip not found, skipping self-extracting archive")
+        return False
+    Path(sfx_path).unlink(missing_ok=True)
+    subprocess.check_call([seven_zip, "a", "-sfx7z.sfx", sfx_path, app_dir])
+    print(f"[OK] Self-extracting archive created: {sfx_path}")
+    return True
+
+def _hash_inputs(paths):
+    """Return a BLAKE2b digest over the names and contents of the given files.
+
+    A missing file contributes a marker, so adding or removing one changes the digest.
+    """
+    digest = hashlib.blake2b()
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(b"\0" + f.read())
+        else:
+            digest.update(b"\1<missing>")
+    return digest.hexdigest()
+
+# Bytes sampled from the start of a file to decide whether deflating it pays off
+COMPRESS_SAMPLE_SIZE = 64 * 1024
+
+def _zip_compress_type(path):
+    """ZIP_STORED for files deflate can barely shrink (UPX-packed binaries,
+    PyInstaller's zlib archives), ZIP_DEFLATED for everything else.
+    """
+    with open(path, "rb") as f:
+        sample = f.read(COMPRESS_SAMPLE_SIZE)
+    if not sample:
+        return zipfile.ZIP_STORED
+    if len(zlib.compress(sample, 1)) > len(sample) * 0.9:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+def _reproducible_env():
+    """Environment for the PyInstaller process with hash seed and timestamps pinned.
+
+    PYTHONHASHSEED is only read at interpreter start-up, so it has to be set
+    for a fresh PyInstaller process rather than in this one.
+    """
+    env = dict(os.environ)
+    env.setdefault("PYTHONHASHSEED", "0")
+    if "SOURCE_DATE_EPOCH" not in env:
+        try:
+            commit_time = subprocess.run(["git", "log", "-1", "--format=%ct"], capture_output=True,
+                                         text=True, check=True).stdout.strip()
+            if commit_time:
+                env["SOURCE_DATE_EPOCH"] = commit_time
+        except (OSError, subprocess.CalledProcessError):
+            print("Could not read last commit time, SOURCE_DATE_EPOCH not set")
+    return env
+
+def _preserve_unchanged_exe(exe_path, hash_path):
+    """Keep the previous mtime when a rebuilt exe is byte-identical.
+
+    Downstream steps (signing, packaging, artifact upload) key off the
+    mtime, so an unchanged exe must not look new.
+    """
+    exe_hash = _hash_inputs([exe_path])
+    if os.path.exists(hash_path):
+        with open(hash_path) as f:
+            previous_hash, _, previous_mtime = f.read().strip().partition(" ")
+        if previous_hash == exe_hash and previous_mtime:
+            os.utime(exe_path, ns=(int(previous_mtime), int(previous_mtime)))
+            print("Executable unchanged since last build, kept previous timestamp")
+            return
+    with open(hash_path, "w") as f:
+        f.write(f"{exe_hash} {os.stat(exe_path).st_mtime_ns}")
+
+def check_requirements(cache_dir=".build-cache"):
+    """Check and install Python requirements.
+
+    pip is skipped entirely when requirements.txt is unchanged since the last
+    successful install (tracked in <cache_dir>/requirements.hash). The cache
+    dir lives outside build/ so it survives PyInstaller cache wipes.
+    """
+    marker = os.path.join(cache_dir, "requirements.hash")
+    requirements_hash = _hash_inputs(["requirements.txt"])
+    if os.path.exists(marker):
+        with open(marker) as f:
+            if f.read().strip() == requirements_hash:
+                print("[OK] Python requirements unchanged, skipping install")
+                return True
+    
     try:
+        # wheel lets pip build and cache wheels instead of re-running setup.py
+        print("Upgrading pip and wheel...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "pip", "wheel"])
+        
         print("Installing Python requirements...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt",
+                               "--prefer-binary", "--cache-dir", os.path.join(cache_dir, "pip")])
         print("[OK] Python requirements installed")
     except subprocess.CalledProcessError as e:
         print(f"Error installing requirements: {e}")
         return False
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(marker, "w") as f:
+        f.write(requirements_hash)
     return True
 
-def build_executable():
-    """Build the executable using PyInstaller."""
+def build_executable(dist_dir="dist", work_dir="build", force_clean=False):
+    """Build the executable using PyInstaller.
+
+    dist_dir/work_dir are passed to PyInstaller as --distpath/--workpath so
+    that parallel builds (see build_all.py) each get their own directories.
+    The work dir is only wiped when the build inputs change (or force_clean
+    is set), so incremental rebuilds reuse PyInstaller's analysis cache.
+    """
     try:
-        # Clean previous builds
-        for path in ["build", "dist"]:
-            if os.path.exists(path):
-                shutil.rmtree(path)
+        # Only wipe the PyInstaller cache when the inputs have changed
+        input_hash = _hash_inputs(BUILD_INPUTS)
+        hash_file = os.path.join(work_dir, ".input_hash")
+        cached_hash = None
+        if os.path.exists(hash_file):
+            with open(hash_file) as f:
+                cached_hash = f.read().strip()
+        inputs_changed = force_clean or cached_hash != input_hash
+        with build_lock():
+            if inputs_changed:
+                print("Build inputs changed, cleaning PyInstaller cache and output...")
+                _discard_dir(work_dir)
+                _discard_dir(dist_dir)
+            else:
+                # PyInstaller (--noconfirm) replaces the output in place, which
+                # keeps dist/.exe.hash for the unchanged-exe check below
+                print("Build inputs unchanged, reusing PyInstaller cache")
         
         print("Building executable with PyInstaller...")
         
-        # PyInstaller command
+        # PyInstaller arguments; everything else lives in the spec file
         cmd = [
-            "pyinstaller",
-            "--onefile",                    # Create a single executable
-            "--noconsole",                  # Don't show console window
-            "--name", "kamiwaza_installer", # Name of the executable
-            "--clean",                      # Clean PyInstaller cache
-            "windows_installer.py"          # Main script
+            sys.executable, "-m", "PyInstaller",
+            "--noconfirm",                  # Overwrite output without asking
+            "--distpath", dist_dir,         # Output directory
+            "--workpath", work_dir,         # Intermediate build directory
+            SPEC_FILE                       # Build options
         ]
         
-        # Add manifest if it exists
-        if os.path.exists("uac_admin.manifest"):
-            cmd.extend(["--manifest", "uac_admin.manifest"])
+        # Compress collected binaries with UPX if it is available
+        upx = find_upx()
+        if upx:
+            cmd.extend(["--upx-dir", os.path.dirname(upx)])
+        else:
+            print("UPX not found, building without compression")
         
-        # Add icon if it exists
-        if os.path.exists("icon.ico"):
-            cmd.extend(["--icon", "icon.ico"])
+        # Separate process so the pinned hash seed applies to the analysis
+        subprocess.check_call(cmd, env=_reproducible_env())
         
-        subprocess.check_call(cmd)
+        # Record the inputs this cache was built from
+        os.makedirs(work_dir, exist_ok=True)
+        with open(hash_file, "w") as f:
+            f.write(input_hash)
         
-        if os.path.exists("dist/kamiwaza_installer.exe"):
+        app_dir = os.path.join(dist_dir, "kamiwaza_installer")
+        exe_path = os.path.join(app_dir, "kamiwaza_installer.exe")
+        if os.path.exists(exe_path):
             print("[OK] Executable built successfully")
+            # PyInstaller leaves the bootloader exe itself uncompressed
+            if upx:
+                subprocess.check_call([upx, "--best", "--lzma", exe_path])
+            _preserve_unchanged_exe(exe_path, os.path.join(dist_dir, ".exe.hash"))
+            # Optional single-file distributable; extraction happens once, not per launch
+            _create_sfx(app_dir, os.path.join(dist_dir, "kamiwaza_installer_sfx.exe"))
             return True
         else:
             print("✗ Executable not found in dist folder")
@@ -64,6 +239,9 @@ def build_executable():
     except subprocess.CalledProcessError as e:
         print(f"Error building executable: {e}")
         return False
+    except Exception as e:
+        print(f"Error building executable: {e}")
+        return False
 
 def create_installer_script():
     """Create a simple installer script."""
@@ -75,8 +253,8 @@ REM Create installation directory
 set INSTALL_DIR=C:\\Program Files\\Kamiwaza
 if not exist "%INSTALL_DIR%" mkdir "%INSTALL_DIR%"
 
-REM Copy executable
-copy "kamiwaza_installer.exe" "%INSTALL_DIR%\\"
+REM Copy application folder
+xcopy "kamiwaza_installer" "%INSTALL_DIR%\\kamiwaza_installer\\" /E /I /Y
 
 REM Create Start Menu shortcut
 set START_MENU=%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs\\Kamiwaza
@@ -85,7 +263,7 @@ if not exist "%START_MENU%" mkdir "%START_MENU%"
 REM Create shortcut
 echo @echo off > "%START_MENU%\\Kamiwaza Installer.bat"
 echo cd /d "%INSTALL_DIR%" >> "%START_MENU%\\Kamiwaza Installer.bat"
-echo start "" "kamiwaza_installer.exe" >> "%START_MENU%\\Kamiwaza Installer.bat"
+echo start "" "kamiwaza_installer\\kamiwaza_installer.exe" >> "%START_MENU%\\Kamiwaza Installer.bat"
 
 REM Add to registry for uninstall
 reg add "HKCU\\Software\\Kamiwaza\\KamiwazaInstaller" /v "installed" /t REG_DWORD /d 1 /f
@@ -134,17 +312,6 @@ def create_zip_installer():
     try:
         print("Creating installer package...")
         
-        # Create installer directory
-        installer_dir = "Kamiwaza_Installer"
-        if os.path.exists(installer_dir):
-            shutil.rmtree(installer_dir)
-        os.makedirs(installer_dir)
-        
-        # Copy files
-        shutil.copy("dist/kamiwaza_installer.exe", installer_dir)
-        shutil.copy("dist/install.bat", installer_dir)
-        shutil.copy("dist/uninstall.bat", installer_dir)
-        
         # Create README
         readme_content = """Kamiwaza Windows Installer
 
@@ -163,14 +330,20 @@ The installer will:
 For more information, see the main README.md file.
 """
         
-        with open(f"{installer_dir}/README.txt", "w") as f:
-            f.write(readme_content)
+        app_files = []
+        for root, _, files in os.walk("dist/kamiwaza_installer"):
+            for name in files:
+                app_files.append(os.path.join(root, name))
         
-        # Create zip file
-        shutil.make_archive("Kamiwaza_Installer", 'zip', installer_dir)
-        
-        # Clean up
-        shutil.rmtree(installer_dir)
+        # Zip straight from dist/ instead of staging copies in a temp folder.
+        # Already-compressed files are stored, so deflate only runs where it
+        # shrinks something; ZipFile.write streams each file from disk.
+        with zipfile.ZipFile("Kamiwaza_Installer.zip", "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for path in app_files:
+                zf.write(path, os.path.relpath(path, "dist"), compress_type=_zip_compress_type(path))
+            zf.write("dist/install.bat", "install.bat")
+            zf.write("dist/uninstall.bat", "uninstall.bat")
+            zf.writestr("README.txt", readme_content.replace("\n", "\r\n"))
         
         print("[OK] Installer package created: Kamiwaza_Installer.zip")
         return True
@@ -181,6 +354,11 @@ For more information, see the main README.md file.
 
 def main():
     """Main build process."""
+    parser = argparse.ArgumentParser(description="Build the Kamiwaza simple Windows installer")
+    parser.add_argument("--force-clean", action="store_true",
+                        help="Discard the PyInstaller cache and rebuild from scratch")
+    args = parser.parse_args()
+    
     print("=== Kamiwaza Simple Windows Installer Builder ===\n")
     
     # Check Python requirements
@@ -188,7 +366,7 @@ def main():
         sys.exit(1)
     
     # Build executable
-    if not build_executable():
+    if not build_executable(force_clean=args.force_clean):
         sys.exit(1)
     
     # Create installer scripts
@@ -201,7 +379,9 @@ def main():
     
     print("\n=== Build Complete! ===")
     print("Files created:")
-    print("- dist/kamiwaza_installer.exe (standalone executable)")
+    print("- dist/kamiwaza_installer/ (application folder)")
+    if os.path.exists("dist/kamiwaza_installer_sfx.exe"):
+        print("- dist/kamiwaza_installer_sfx.exe (self-extracting archive)")
     print("- Kamiwaza_Installer.zip (installer package)")
     print("\nTo install: Extract the zip and run install.bat as administrator")
 
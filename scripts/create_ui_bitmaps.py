@@ -3,142 +3,201 @@
 Create custom UI bitmaps for WiX installer from kamiwaza logo design
 """
 
-from PIL import Image, ImageDraw, ImageFont
+import functools
 import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Fall back to compositing and encoding with PIL
+
+TEAL = (0, 128, 128)  # Proper teal color (matching the logo)
+WHITE = (255, 255, 255)
+
+@functools.lru_cache(maxsize=None)
+def _font(px):
+    """Load Arial at the given pixel size once, falling back to PIL's default font"""
+    from PIL import ImageFont  # Deferred: Pillow is only needed once a bitmap is drawn
+    try:
+        return ImageFont.truetype("arial.ttf", px)
+    except OSError:
+        return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=32)
+def _bbox(text, px):
+    """Bounding box of text rendered at the origin with _font(px)"""
+    return _font(px).getbbox(text)
+
+@functools.lru_cache(maxsize=None)
+def _make_chevron_sprite(size):
+    """Black right-pointing chevron (triangle) on a transparent canvas"""
+    from PIL import Image, ImageDraw
+    sprite = Image.new('RGBA', (size + 1, size + 1), (0, 0, 0, 0))
+    points = [
+        (0, 0),  # Left point
+        (size, size // 2),  # Right point
+        (0, size)  # Bottom point
+    ]
+    ImageDraw.Draw(sprite).polygon(points, fill=(0, 0, 0, 255))
+    return sprite
+
+@functools.lru_cache(maxsize=None)
+def _chevron_mask(size):
+    """Boolean (size+1, size+1) mask of the same chevron, rasterized with numpy.
+    Half-plane tests against the two slanted edges, rounded like ImageDraw.polygon.
+    """
+    mid = size // 2
+    ys, xs = np.indices((size + 1, size + 1))
+    return (2 * ys * size > (2 * xs - 1) * mid) & (2 * (size - ys) * size > (2 * xs - 1) * (size - mid))
+
+def _chevron(size):
+    """Chevron for _render_bitmap: a numpy mask when available, otherwise a PIL sprite"""
+    return _make_chevron_sprite(size) if np is None else _chevron_mask(size)
+
+@functools.lru_cache(maxsize=None)
+def _make_wazakami_sprite(font_px, gap):
+    """Render "KAMI/WAZA" (split like the logo) in white on a transparent canvas.
+    Returns (sprite, text_width, text_height) for layout.
+    """
+    from PIL import Image, ImageDraw
+    font = _font(font_px)
+    text_top = "KAMI"
+    text_bottom = "WAZA"
+
+    # Calculate text positions
+    bbox_top = _bbox(text_top, font_px)
+    bbox_bottom = _bbox(text_bottom, font_px)
+
+    text_width = max(bbox_top[2] - bbox_top[0], bbox_bottom[2] - bbox_bottom[0])
+    text_height = (bbox_top[3] - bbox_top[0]) + (bbox_bottom[3] - bbox_bottom[0]) + gap
+    bottom_y = (bbox_top[3] - bbox_top[0]) + gap
+
+    # Transparent white so anti-aliased edges blend cleanly when pasted
+    sprite = Image.new('RGBA', (max(bbox_top[2], bbox_bottom[2]), bottom_y + bbox_bottom[3]), WHITE + (0,))
+    draw = ImageDraw.Draw(sprite)
+    draw.text((0, 0), text_top, fill=WHITE, font=font)
+    draw.text((0, bottom_y), text_bottom, fill=WHITE, font=font)
+    return sprite, text_width, text_height
+
+@functools.lru_cache(maxsize=None)
+def _make_text_sprite(text, font_px):
+    """Render a single line of white text on a transparent canvas"""
+    from PIL import Image, ImageDraw
+    bbox = _bbox(text, font_px)
+    sprite = Image.new('RGBA', (bbox[2], bbox[3]), WHITE + (0,))
+    ImageDraw.Draw(sprite).text((0, 0), text, fill=WHITE, font=_font(font_px))
+    return sprite
+
+def _blit(arr, sprite, x, y):
+    """Alpha-blend an RGBA sprite into an RGB uint8 array (same rounding as Image.paste).
+    A boolean mask is painted solid black.
+    """
+    if isinstance(sprite, np.ndarray) and sprite.dtype == bool:
+        region = arr[y:y + sprite.shape[0], x:x + sprite.shape[1]]
+        region[sprite[:region.shape[0], :region.shape[1]]] = (0, 0, 0)
+        return
+    src = np.asarray(sprite, dtype=np.uint32)
+    region = arr[y:y + src.shape[0], x:x + src.shape[1]]
+    src = src[:region.shape[0], :region.shape[1]]
+    alpha = src[..., 3:]
+    blended = region * (255 - alpha) + src[..., :3] * alpha + 128
+    region[...] = ((blended >> 8) + blended) >> 8
+
+def _write_bmp(path, arr):
+    """Write an RGB uint8 (H, W, 3) array as a 24-bit bottom-up BMP"""
+    height, width, _ = arr.shape
+    row_size = (width * 3 + 3) & ~3
+    rows = np.zeros((height, row_size), dtype=np.uint8)
+    rows[:, :width * 3] = arr[::-1, :, ::-1].reshape(height, width * 3)  # bottom-up BGR
+    data = rows.tobytes()
+    # 3780 px/m (96 DPI) in both directions, the resolution PIL's BMP writer used
+    header = struct.pack('<2sIHHIIiiHHIIiiII', b'BM', 54 + len(data), 0, 0, 54,
+                         40, width, height, 1, 24, 0, len(data), 3780, 3780, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(header + data)
+
+def _render_bitmap(path, size, placements):
+    """Composite (sprite, (x, y)) placements onto a teal canvas and save as BMP"""
+    width, height = size
+    if np is None:
+        from PIL import Image
+        # Teal background filled by the constructor
+        img = Image.new('RGB', size, TEAL)
+        for sprite, xy in placements:
+            img.paste(sprite, xy, sprite)
+        img.save(path, format='BMP')
+        return
+    arr = np.full((height, width, 3), TEAL, dtype=np.uint8)
+    for sprite, (x, y) in placements:
+        _blit(arr, sprite, x, y)
+    _write_bmp(path, arr)
 
 def create_banner_bitmap():
     """Create banner bitmap (493x58 pixels) with Kamiwaza logo design"""
     width, height = 493, 58
-    img = Image.new('RGB', (width, height), (255, 255, 255))
-    draw = ImageDraw.Draw(img)
-    
-    # Create teal background (matching the logo)
-    teal_color = (0, 128, 128)  # Proper teal color
-    draw.rectangle([0, 0, width, height], fill=teal_color)
-    
-    # Add black right-pointing chevrons on the left side
-    chevron_color = (0, 0, 0)  # Black chevrons
-    
-    # Draw two chevrons pointing right (smaller on top, larger below)
+    placements = []
+
+    # Add two black right-pointing chevrons on the left side (smaller on top, larger below)
     chevron_sizes = [12, 16]
     chevron_x = 30
     chevron_y_base = height // 2
-    
+
     for i, size in enumerate(chevron_sizes):
         y_offset = i * 8  # Stack them vertically
         y = chevron_y_base - 8 + y_offset
-        
-        # Draw right-pointing chevron (triangle pointing right)
-        points = [
-            (chevron_x, y),  # Left point
-            (chevron_x + size, y + size // 2),  # Right point
-            (chevron_x, y + size)  # Bottom point
-        ]
-        draw.polygon(points, fill=chevron_color)
-    
+        placements.append((_chevron(size), (chevron_x, y)))
+
     # Add "KAMI/WAZA" text on the right side
-    try:
-        font = ImageFont.truetype("arial.ttf", 16)
-    except:
-        font = ImageFont.load_default()
-    
-    # Split text like the logo
-    text_top = "KAMI"
-    text_bottom = "WAZA"
-    
-    # Calculate text positions
-    bbox_top = draw.textbbox((0, 0), text_top, font=font)
-    bbox_bottom = draw.textbbox((0, 0), text_bottom, font=font)
-    
-    text_width = max(bbox_top[2] - bbox_top[0], bbox_bottom[2] - bbox_bottom[0])
-    text_height = (bbox_top[3] - bbox_top[0]) + (bbox_bottom[3] - bbox_bottom[0]) + 2
-    
+    text, text_width, text_height = _make_wazakami_sprite(16, 2)
     x = width - text_width - 20
     y = (height - text_height) // 2
-    
-    # Draw text in white
-    draw.text((x, y), text_top, fill=(255, 255, 255), font=font)
-    draw.text((x, y + (bbox_top[3] - bbox_top[0]) + 2), text_bottom, fill=(255, 255, 255), font=font)
-    
+    placements.append((text, (x, y)))
+
     # Save as BMP
-    img.save("banner.bmp", format='BMP')
+    _render_bitmap("banner.bmp", (width, height), placements)
     print("Created banner.bmp (493x58)")
 
 def create_dialog_bitmap():
     """Create dialog bitmap (493x312 pixels) with Kamiwaza logo design"""
     width, height = 493, 312
-    img = Image.new('RGB', (width, height), (255, 255, 255))
-    draw = ImageDraw.Draw(img)
-    
-    # Create teal background
-    teal_color = (0, 128, 128)  # Proper teal color
-    draw.rectangle([0, 0, width, height], fill=teal_color)
-    
-    # Add large black right-pointing chevrons in the center
-    chevron_color = (0, 0, 0)  # Black chevrons
-    
-    # Draw two large chevrons pointing right (smaller on top, larger below)
+    placements = []
+
+    # Add two large black right-pointing chevrons in the center (smaller on top, larger below)
     chevron_sizes = [40, 55]
     chevron_x = width // 2 - 80  # Center the chevrons
     chevron_y_base = height // 2 - 30
-    
+
     for i, size in enumerate(chevron_sizes):
         y_offset = i * 15  # Stack them vertically
         y = chevron_y_base + y_offset
-        
-        # Draw right-pointing chevron (triangle pointing right)
-        points = [
-            (chevron_x, y),  # Left point
-            (chevron_x + size, y + size // 2),  # Right point
-            (chevron_x, y + size)  # Bottom point
-        ]
-        draw.polygon(points, fill=chevron_color)
-    
+        placements.append((_chevron(size), (chevron_x, y)))
+
     # Add "KAMI/WAZA" text below chevrons
-    try:
-        font = ImageFont.truetype("arial.ttf", 32)
-    except:
-        font = ImageFont.load_default()
-    
-    # Split text like the logo
-    text_top = "KAMI"
-    text_bottom = "WAZA"
-    
-    # Calculate text positions
-    bbox_top = draw.textbbox((0, 0), text_top, font=font)
-    bbox_bottom = draw.textbbox((0, 0), text_bottom, font=font)
-    
-    text_width = max(bbox_top[2] - bbox_top[0], bbox_bottom[2] - bbox_bottom[0])
-    text_height = (bbox_top[3] - bbox_top[0]) + (bbox_bottom[3] - bbox_bottom[0]) + 4
-    
+    text, text_width, text_height = _make_wazakami_sprite(32, 4)
     x = (width - text_width) // 2
     y = chevron_y_base + 100  # Position below chevrons
-    
-    # Draw text in white
-    draw.text((x, y), text_top, fill=(255, 255, 255), font=font)
-    draw.text((x, y + (bbox_top[3] - bbox_top[0]) + 4), text_bottom, fill=(255, 255, 255), font=font)
-    
+    placements.append((text, (x, y)))
+
     # Add "Installer" subtitle
-    try:
-        subtitle_font = ImageFont.truetype("arial.ttf", 14)
-    except:
-        subtitle_font = ImageFont.load_default()
-    
     subtitle = "Installer"
-    bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
+    bbox = _bbox(subtitle, 14)
     subtitle_width = bbox[2] - bbox[0]
-    subtitle_height = bbox[3] - bbox[1]
-    
+
     subtitle_x = (width - subtitle_width) // 2
     subtitle_y = y + text_height + 8
-    
-    draw.text((subtitle_x, subtitle_y), subtitle, fill=(255, 255, 255), font=subtitle_font)
-    
+
+    placements.append((_make_text_sprite(subtitle, 14), (subtitle_x, subtitle_y)))
+
     # Save as BMP
-    img.save("dialog.bmp", format='BMP')
+    _render_bitmap("dialog.bmp", (width, height), placements)
     print("Created dialog.bmp (493x312)")
 
 if __name__ == "__main__":
-    create_banner_bitmap()
-    create_dialog_bitmap()
-    print("Custom UI bitmaps created successfully!") 
\ No newline at end of file
+    # Independent outputs; Pillow/numpy release the GIL for most of the work
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(create) for create in (create_banner_bitmap, create_dialog_bitmap)]
+        for future in futures:
+            future.result()
+    print("Custom UI bitmaps created successfully!")
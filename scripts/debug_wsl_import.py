@@ -4,36 +4,63 @@ Debug WSL import process to identify why 'kamiwaza' instance isn't being created
 """
 import subprocess
 import os
+import sys
+import shutil
 import tempfile
+import threading
+import time
 
 def run_command(command, timeout=None):
-    """Run command and return exit code, stdout, stderr"""
-    print(f"Running: {' '.join(command)}")
+    """Run command, echoing its output as it arrives; return exit code, stdout, stderr.
+    stderr is merged into stdout, so the returned stderr only carries timeout/launch errors.
+    """
+    # Flush the buffered step messages before the child starts so the output reads in order
+    print(f"Running: {' '.join(command)}", flush=True)
     try:
+        # CREATE_NO_WINDOW keeps Windows from allocating a console per child.
+        # The pipe stays binary; lines are decoded one by one below
         process = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8'
+            stderr=subprocess.STDOUT,
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
         )
-        
-        stdout, stderr = process.communicate(timeout=timeout)
-        print(f"Exit code: {process.returncode}")
-        if stdout:
-            print(f"STDOUT: {stdout.strip()}")
-        if stderr:
-            print(f"STDERR: {stderr.strip()}")
-        
-        return process.returncode, stdout, stderr
-        
-    except subprocess.TimeoutExpired:
-        process.kill()
-        print(f"Command timed out after {timeout} seconds")
-        return 1, "", f"Command timed out after {timeout} seconds"
     except Exception as e:
         print(f"Error running command: {e}")
         return 1, "", str(e)
+    
+    # Reading the pipe blocks, so a timer enforces the timeout by killing the child
+    timed_out = threading.Event()
+    def kill():
+        timed_out.set()
+        process.kill()
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.start()
+    
+    buf = []
+    try:
+        for raw in process.stdout:
+            # 'replace' keeps stray non-UTF-8 bytes (e.g. wsl.exe UTF-16 output) from aborting the read
+            line = raw.decode('utf-8', 'replace')
+            print(line, end='', flush=True)  # Live progress for slow WSL/curl calls
+            buf.append(line)
+        returncode = process.wait()
+    finally:
+        if timer:
+            timer.cancel()
+    
+    if timed_out.is_set():
+        print(f"Command timed out after {timeout} seconds")
+        return 1, ''.join(buf), f"Command timed out after {timeout} seconds"
+    print(f"Exit code: {returncode}")
+    return returncode, ''.join(buf), ""
+
+# Resolved once so each launch skips the PATH/PATHEXT search
+_WSL = shutil.which('wsl') or 'wsl'
+
+# Shared time budget (seconds) for all wsl.exe calls in test_wsl_import
+WSL_TIME_BUDGET = 105
 
 def test_wsl_import():
     """Test WSL import process step by step"""
@@ -41,9 +68,19 @@ def test_wsl_import():
     
     instance_name = "kamiwaza-debug"
     
+    # A cold WSL start can take most of the budget on the first call while later calls
+    # return almost instantly, so each wsl.exe call gets whatever budget is left
+    wsl_budget = WSL_TIME_BUDGET
+    def run_wsl(command):
+        nonlocal wsl_budget
+        start = time.monotonic()
+        result = run_command(command, timeout=max(1, wsl_budget))
+        wsl_budget -= time.monotonic() - start
+        return result
+    
     # Step 1: Check current WSL distributions
     print("1. Checking current WSL distributions:")
-    ret, out, err = run_command(['wsl', '--list', '--verbose'], timeout=15)
+    ret, out, err = run_wsl([_WSL, '--list', '--verbose'])
     if ret != 0:
         print("ERROR: WSL not available")
         return False
@@ -51,7 +88,7 @@ def test_wsl_import():
     # Step 2: Remove test instance if it exists
     print(f"\n2. Removing existing {instance_name} instance (if any):")
     if instance_name in out:
-        run_command(['wsl', '--unregister', instance_name], timeout=30)
+        run_wsl([_WSL, '--unregister', instance_name])
     else:
         print(f"No existing {instance_name} instance found")
     
@@ -67,23 +104,29 @@ def test_wsl_import():
     os.makedirs(wsl_dir, exist_ok=True)
     print(f"Created WSL directory: {wsl_dir}")
     
-    # Step 4: Test download URL first
+    # Step 4: Test download URL first (curl.exe ships with Windows 10+, no PowerShell startup)
     print("\n4. Testing Ubuntu 24.04 rootfs URL:")
     download_url = "https://cloud-images.ubuntu.com/wsl/releases/24.04/current/ubuntu-noble-wsl-amd64-wsl.rootfs.tar.gz"
-    test_cmd = [
-        'powershell', '-Command',
-        f"try {{ $response = Invoke-WebRequest -Uri '{download_url}' -Method Head -UseBasicParsing; Write-Output ('Status: ' + $response.StatusCode + ' Size: ' + [Math]::Round($response.Headers.'Content-Length'[0]/1MB, 2) + ' MB') }} catch {{ Write-Output ('Error: ' + $_.Exception.Message) }}"
-    ]
-    ret, out, err = run_command(test_cmd, timeout=30)
-    if ret != 0 or 'Error:' in out:
+    ret, out, err = run_command(['curl.exe', '-sSIL', '--fail', '--connect-timeout', '30', download_url], timeout=30)
+    if ret != 0:
         print("ERROR: Cannot access Ubuntu 24.04 rootfs URL")
         return False
     
+    # Headers of the final response (after redirects)
+    status, content_length = None, None
+    for line in out.splitlines():
+        if line.startswith('HTTP/'):
+            status, content_length = line.split()[1], None
+        elif line.lower().startswith('content-length:'):
+            content_length = int(line.split(':', 1)[1])
+    size_mb = round(content_length / (1024 * 1024), 2) if content_length else 'unknown'
+    print(f"Status: {status} Size: {size_mb} MB")
+    
     # Step 5: Download a small test to verify the process (first 10MB only)
     print("\n5. Testing partial download (first 10MB for verification):")
     partial_download_cmd = [
-        'powershell', '-Command',
-        f"try {{ $response = Invoke-WebRequest -Uri '{download_url}' -OutFile '{rootfs_file}' -UseBasicParsing -Headers @{{Range='bytes=0-10485759'}}; Write-Output 'Partial download completed' }} catch {{ Write-Output ('Download error: ' + $_.Exception.Message) }}"
+        'curl.exe', '-sSL', '--fail', '--connect-timeout', '30',
+        '--range', '0-10485759', '-o', rootfs_file, download_url
     ]
     ret, out, err = run_command(partial_download_cmd, timeout=60)
     
@@ -91,12 +134,13 @@ def test_wsl_import():
         print("ERROR: Partial download failed")
         return False
     
-    # Check if file was created
-    if not os.path.exists(rootfs_file):
+    # Check if file was created (one stat for existence and size)
+    try:
+        file_size = os.stat(rootfs_file).st_size
+    except FileNotFoundError:
         print("ERROR: Downloaded file not found")
         return False
     
-    file_size = os.path.getsize(rootfs_file)
     print(f"Partial file created: {file_size} bytes")
     
     # Clean up partial file
@@ -108,30 +152,25 @@ def test_wsl_import():
     # Create a dummy small tar.gz file for testing
     dummy_content = "This is a test file for WSL import syntax verification"
     dummy_file = os.path.join(temp_dir, f'dummy-test-{os.getpid()}.tar.gz')
-    
-    # Create dummy tar.gz using PowerShell
-    create_dummy_cmd = [
-        'powershell', '-Command',
-        f"$content = '{dummy_content}'; $bytes = [System.Text.Encoding]::UTF8.GetBytes($content); Set-Content -Path '{dummy_file}' -Value $bytes -Encoding Byte"
-    ]
-    run_command(create_dummy_cmd, timeout=10)
+    with open(dummy_file, 'wb') as f:
+        f.write(dummy_content.encode('utf-8'))
     
     if os.path.exists(dummy_file):
         print(f"Created dummy file: {dummy_file}")
         
         # Test WSL import command
         print("Testing WSL import command:")
-        ret, out, err = run_command(['wsl', '--import', instance_name, wsl_dir, dummy_file], timeout=30)
+        ret, out, err = run_wsl([_WSL, '--import', instance_name, wsl_dir, dummy_file])
         
         if ret == 0:
             print("[OK] WSL import command syntax is correct")
             
             # Clean up test instance
             print("Cleaning up test instance:")
-            run_command(['wsl', '--unregister', instance_name], timeout=30)
+            run_wsl([_WSL, '--unregister', instance_name])
         else:
             print("✗ WSL import command failed")
-            print(f"Error details: {err}")
+            print(f"Error details: {out.strip()}")
         
         # Clean up dummy file
         os.remove(dummy_file)
@@ -150,6 +189,9 @@ def test_wsl_import():
     return True
 
 if __name__ == "__main__":
+    # Block-buffer the step messages (a console otherwise writes every print separately);
+    # run_command flushes before each child process and for its live output
+    sys.stdout.reconfigure(line_buffering=False)
     success = test_wsl_import()
     if success:
         print("\n[OK] WSL import debugging completed")
@@ -12,14 +12,233 @@ import subprocess
 import re
 import os
 import platform
+import threading
+import csv
+import hashlib
+import io
+import json
+import time
+from pathlib import Path
+
+# detect_gpu_hardware results are reused across installer runs for this long
+HW_CACHE_TTL = 24 * 60 * 60
+
+# Cannot change while the process runs; platform.release() hits the registry on Windows
+_WINDOWS_RELEASE = platform.release()
+IS_WINDOWS = platform.system() == "Windows"
+
+
+def _hw_cache_path():
+    """%LOCALAPPDATA%\\Kamiwaza\\hwcache.json, or None when LOCALAPPDATA is unset"""
+    local_appdata = os.environ.get('LOCALAPPDATA')
+    return Path(local_appdata, 'Kamiwaza', 'hwcache.json') if local_appdata else None
+
+
+def _hw_signature():
+    """Hash of the signals that invalidate cached GPU detection"""
+    return hashlib.sha256(f"{platform.node()}|{_WINDOWS_RELEASE}".encode()).hexdigest()
+
+
+def _load_hw_cache():
+    """Return cached GPU detection results, or None if missing, stale or from another machine"""
+    path = _hw_cache_path()
+    if path is None:
+        return None
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('signature') != _hw_signature():
+        return None
+    timestamp, results = data.get('timestamp'), data.get('results')
+    if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool) or not isinstance(results, dict):
+        return None  # Hand-edited or written by an incompatible version
+    if time.time() - timestamp > HW_CACHE_TTL:
+        return None
+    return results
+
+
+def _save_hw_cache(results):
+    """Persist GPU detection results for _load_hw_cache (best effort)"""
+    path = _hw_cache_path()
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            'signature': _hw_signature(),
+            'timestamp': time.time(),
+            'results': results,
+        }), encoding='utf-8')
+    except OSError:
+        pass
+
+
+# Command lists are constants; the get_*_commands methods return them as-is
+INTEL_OPENCL_INSTALL_CMDS = (
+    # Remove conflicting packages
+    "sudo apt-get purge -y intel-opencl-icd intel-level-zero-gpu level-zero",
+    "sudo apt-get autoremove -y",
+    "sudo apt-get clean",
+
+    # add-apt-repository comes from software-properties-common
+    "sudo apt-get update",
+    "sudo apt-get install -y software-properties-common",
+
+    # Add Intel oneAPI repository and Intel Graphics PPA
+    "wget -O- https://apt.repos.intel.com/intel-gpg-keys/GPG-PUB-KEY-INTEL-SW-PRODUCTS.PUB | gpg --dearmor | sudo tee /usr/share/keyrings/oneapi-archive-keyring.gpg > /dev/null",
+    'echo "deb [signed-by=/usr/share/keyrings/oneapi-archive-keyring.gpg] https://apt.repos.intel.com/oneapi all main" | sudo tee /etc/apt/sources.list.d/oneAPI.list',
+    "sudo add-apt-repository -y --no-update ppa:kobuk-team/intel-graphics",
+
+    # One update for both new sources, then OpenCL loader/tools, Intel OpenCL
+    # runtime and media drivers in a single transaction
+    "sudo apt-get update",
+    "sudo apt-get install -y ocl-icd-libopencl1 ocl-icd-opencl-dev opencl-headers clinfo "
+    "intel-oneapi-runtime-opencl intel-media-va-driver-non-free libmfx-gen1 libvpl2 libvpl-tools "
+    "libva-glx2 va-driver-all vainfo",
+
+    # Configure permissions
+    "sudo usermod -a -G render $USER",
+)
+
+INTEL_OPENCL_VERIFY_CMDS = (
+    "clinfo",  # Should show Intel OpenCL platform (checked in Python)
+)
+
+AMD_GPU_SUPPORT_CMDS = (
+    # Remove conflicting packages
+    "sudo apt-get purge -y intel-opencl-icd intel-level-zero-gpu level-zero",
+    "sudo apt-get autoremove -y",
+    "sudo apt-get clean",
+
+    # Install OpenCL loader and tools
+    "sudo apt-get update",
+    "sudo apt-get install -y ocl-icd-libopencl1 ocl-icd-opencl-dev opencl-headers clinfo",
+
+    # Add AMD ROCm repository (for newer AMD GPUs)
+    "wget -qO - https://repo.radeon.com/rocm/rocm.gpg.key | sudo apt-key add -",
+    'echo "deb [arch=amd64] https://repo.radeon.com/rocm/apt/debian ubuntu main" | sudo tee /etc/apt/sources.list.d/rocm.list',
+
+    # Install AMD OpenCL runtime
+    "sudo apt-get update",
+    "sudo apt-get install -y rocm-opencl-runtime",
+
+    # Install Mesa drivers for older AMD GPUs
+    "sudo apt-get install -y mesa-opencl-icd",
+
+    # Configure permissions
+    "sudo usermod -a -G render $USER",
+)
+
+ARM_GPU_SUPPORT_CMDS = (
+    # Install OpenCL loader and tools
+    "sudo apt-get update",
+    "sudo apt-get install -y ocl-icd-libopencl1 ocl-icd-opencl-dev opencl-headers clinfo",
+
+    # Install Mesa drivers (common for ARM Mali GPUs)
+    "sudo apt-get install -y mesa-opencl-icd",
+
+    # Install ARM Mali drivers if available
+    "sudo apt-get install -y mali-g610-firmware || echo 'Mali firmware not available'",
+
+    # Configure permissions
+    "sudo usermod -a -G render $USER",
+)
+
+# Per-vendor CPU tuning (get_vendor_specific_optimizations); other vendors get the generic set
+VENDOR_OPTIMIZATIONS = {
+    'Intel': {
+        'description': 'Intel CPU optimizations',
+        'commands': (
+            # Intel-specific optimizations
+            'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor',
+            'echo 0 | sudo tee /proc/sys/kernel/nmi_watchdog',
+            'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us',
+        ),
+    },
+    'AMD': {
+        'description': 'AMD CPU optimizations',
+        'commands': (
+            # AMD-specific optimizations
+            'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor',
+            'echo 0 | sudo tee /proc/sys/kernel/nmi_watchdog',
+            'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us',
+        ),
+    },
+    'ARM': {
+        'description': 'ARM CPU optimizations',
+        'commands': (
+            # ARM-specific optimizations
+            'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor 2>/dev/null || echo "CPU governor not available"',
+            'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us',
+        ),
+    },
+}
+
+GENERIC_OPTIMIZATION_CMDS = (
+    'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor 2>/dev/null || echo "CPU governor not available"',
+    'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us',
+)
 
 
 class HardwareDetector:
     """Detect and configure hardware-specific optimizations"""
     
+    # x86 flags followed by ARM hwcap names, as listed in /proc/cpuinfo
+    CPU_FEATURES = ('avx', 'avx2', 'sse4_1', 'sse4_2', 'aes', 'neon', 'asimd', 'sve')
+    
+    # /proc/cpuinfo vendor_id strings -> vendor names
+    VENDOR_MAP = {
+        'GenuineIntel': 'Intel',
+        'AuthenticAMD': 'AMD',
+        'CentaurHauls': 'Centaur',
+        'CyrixInstead': 'Cyrix',
+        'TransmetaCPU': 'Transmeta',
+        'GenuineTMx86': 'Transmeta',
+        'RiseRiseRise': 'Rise',
+        'SiS SiS SiS': 'SiS',
+        'UMC UMC UMC': 'UMC',
+        'NexGenDriven': 'NexGen',
+    }
+    
+    VENDOR_ID_RE = re.compile(r'^vendor_id\s*:\s*(.+?)\s*$', re.MULTILINE)
+    CPU_FLAGS_RE = re.compile(r'^(flags|Features)\s*:\s*(.*)$', re.MULTILINE)
+    
+    # GPU name -> class in one pass; alternatives are tried in priority order.
+    # Lookaheads match each keyword anywhere in the name, in either order.
+    GPU_CLASS_RE = re.compile(
+        r'\A(?:(?P<nvidia_rtx>(?=.*nvidia)(?=.*rtx))'
+        r'|(?P<intel_arc>(?=.*intel)(?=.*arc))'
+        r'|(?P<intel_integrated>(?=.*intel)(?=.*(?:uhd|iris|hd graphics))))',
+        re.IGNORECASE | re.DOTALL
+    )
+    
+    # Every WSL-side probe in one bash invocation; each section follows an ===NAME=== line.
+    # CPUINFO is the first processor block of /proc/cpuinfo, DTMODEL the ARM device-tree model.
+    PROBE_SCRIPT = (
+        'echo ===CPUINFO===; sed -n "1,/^$/p" /proc/cpuinfo; '
+        'echo ===DTMODEL===; tr -d "\\0" 2>/dev/null </proc/device-tree/model; echo; '
+        'echo ===UNAME===; uname -r; '
+        'echo ===DRI===; test -d /dev/dri && ls /dev/dri || echo NONE; '
+        'echo ===END==='
+    )
+    
+    # Marks the end of each command in the batched install script
+    STEP_MARKER = '::STEP::'
+    
     def __init__(self, logger=None):
         self.logger = logger or self._default_logger
         self.detected_hardware = {}
+        # Detection results keyed by tuple(wsl_cmd); each detection costs WSL round-trips
+        self._vendor_cache = {}
+        self._features_cache = {}
+        self._gpu_cache = {}
+        self._wsl_version_cache = {}
+        self._probe_cache = {}
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        # Host GPU enumeration only exists on Windows; pick the implementation once
+        self._detect_gpu = self._detect_gpu_windows if IS_WINDOWS else self._detect_gpu_linux
         
     def _default_logger(self, message):
         """Default logger if none provided"""
@@ -29,6 +248,11 @@ class HardwareDetector:
         """Log message using provided logger"""
         self.logger(message)
     
+    def _record(self, name, value):
+        """Store a detection result in detected_hardware (thread-safe)"""
+        with self._lock:
+            self.detected_hardware[name] = value
+    
     def run_wsl_command(self, wsl_cmd, command, timeout=30):
         """Run command in WSL instance"""
         try:
@@ -45,93 +269,99 @@ class HardwareDetector:
         except Exception as e:
             return False, "", str(e)
     
+    def _probe(self, wsl_cmd):
+        """Run PROBE_SCRIPT once per wsl_cmd and return its sections as a dict.
+        Returns None (and retries on the next call) if the probe failed.
+        """
+        key = tuple(wsl_cmd)
+        with self._probe_lock:
+            if key in self._probe_cache:
+                return self._probe_cache[key]
+            
+            success, output, error = self.run_wsl_command(wsl_cmd, self.PROBE_SCRIPT, timeout=15)
+            parts = re.split(r'^===(\w+)===$', output, flags=re.MULTILINE)
+            sections = {name: body.strip() for name, body in zip(parts[1::2], parts[2::2])}
+            if not success or 'END' not in sections:
+                self.log(f"[WARN] Hardware probe failed: {error or 'incomplete output'}")
+                return None
+            
+            self._probe_cache[key] = sections
+            return sections
+    
     def detect_cpu_vendor(self, wsl_cmd):
         """Detect CPU vendor (Intel, AMD, ARM, etc.)"""
+        key = tuple(wsl_cmd)
+        if key in self._vendor_cache:
+            return self._vendor_cache[key]
+        
         self.log("Detecting CPU vendor...")
         
-        # More comprehensive vendor detection
-        vendor_detection_cmd = '''
-        if grep -q "GenuineIntel" /proc/cpuinfo; then
-            echo "Intel"
-        elif grep -q "AuthenticAMD" /proc/cpuinfo; then
-            echo "AMD"
-        elif grep -q "ARM" /proc/cpuinfo || grep -q "ARM" /proc/device-tree/model 2>/dev/null; then
-            echo "ARM"
-        elif grep -q "VIA" /proc/cpuinfo; then
-            echo "VIA"
-        elif grep -q "CentaurHauls" /proc/cpuinfo; then
-            echo "Centaur"
-        elif grep -q "CyrixInstead" /proc/cpuinfo; then
-            echo "Cyrix"
-        elif grep -q "TransmetaCPU" /proc/cpuinfo; then
-            echo "Transmeta"
-        elif grep -q "RiseRiseRise" /proc/cpuinfo; then
-            echo "Rise"
-        elif grep -q "SiS SiS SiS" /proc/cpuinfo; then
-            echo "SiS"
-        elif grep -q "UMC UMC UMC" /proc/cpuinfo; then
-            echo "UMC"
-        elif grep -q "NexGenDriven" /proc/cpuinfo; then
-            echo "NexGen"
-        else
-            # Try to extract vendor from cpuinfo
-            vendor=$(grep "^vendor_id" /proc/cpuinfo | head -1 | cut -d: -f2 | xargs)
-            if [ -n "$vendor" ]; then
-                echo "$vendor"
-            else
-                echo "Unknown"
-            fi
-        fi
-        '''
-        
-        success, output, error = self.run_wsl_command(wsl_cmd, vendor_detection_cmd)
+        probe = self._probe(wsl_cmd)
         
-        if success:
-            cpu_vendor = output.strip()
-            self.detected_hardware['cpu_vendor'] = cpu_vendor
+        if probe is not None:
+            cpu_vendor = self._parse_cpu_vendor(probe['CPUINFO'] + '\n' + probe['DTMODEL'])
+            self._vendor_cache[key] = cpu_vendor
+            self._record('cpu_vendor', cpu_vendor)
             self.log(f"[OK] CPU vendor detected: {cpu_vendor}")
             return cpu_vendor
         else:
-            self.log(f"[WARN] Could not detect CPU vendor: {error}")
+            self.log("[WARN] Could not detect CPU vendor")
             return "Unknown"
     
+    def _parse_cpu_vendor(self, cpuinfo):
+        """Map /proc/cpuinfo text to a vendor name"""
+        match = self.VENDOR_ID_RE.search(cpuinfo)
+        vendor_id = match.group(1) if match else ''
+        if vendor_id in self.VENDOR_MAP:
+            return self.VENDOR_MAP[vendor_id]
+        # ARM kernels report no vendor_id; the model name or device-tree model names the core
+        if 'ARM' in cpuinfo:
+            return "ARM"
+        if 'VIA' in cpuinfo:
+            return "VIA"
+        return vendor_id or "Unknown"
+    
     def detect_cpu_features(self, wsl_cmd):
         """Detect CPU features and capabilities"""
-        self.log("Detecting CPU features...")
+        key = tuple(wsl_cmd)
+        if key in self._features_cache:
+            return self._features_cache[key]
         
-        features = {}
+        self.log("Detecting CPU features...")
         
-        # Check for common CPU features
-        feature_checks = {
-            'avx': 'grep -q "avx" /proc/cpuinfo',
-            'avx2': 'grep -q "avx2" /proc/cpuinfo', 
-            'sse4_1': 'grep -q "sse4_1" /proc/cpuinfo',
-            'sse4_2': 'grep -q "sse4_2" /proc/cpuinfo',
-            'aes': 'grep -q "aes" /proc/cpuinfo'
-        }
+        # x86 lists "flags", ARM lists "Features"
+        probe = self._probe(wsl_cmd)
+        success = probe is not None
+        match = self.CPU_FLAGS_RE.search(probe['CPUINFO']) if success else None
+        flagset = frozenset(match.group(2).split()) if match else frozenset()
         
-        for feature, check_cmd in feature_checks.items():
-            success, _, _ = self.run_wsl_command(wsl_cmd, check_cmd)
-            features[feature] = success
-            if success:
+        features = {name: name in flagset for name in self.CPU_FEATURES}
+        for feature, present in features.items():
+            if present:
                 self.log(f"[OK] CPU feature detected: {feature}")
         
-        self.detected_hardware['cpu_features'] = features
+        if success:
+            self._features_cache[key] = features
+        self._record('cpu_features', features)
         return features
     
     def detect_gpu_info(self, wsl_cmd):
         """Detect GPU information (primarily for Intel integrated graphics)"""
+        key = tuple(wsl_cmd)
+        if key in self._gpu_cache:
+            return self._gpu_cache[key]
+        
         self.log("Detecting GPU information...")
         
         # Check for GPU devices in WSL
-        success, output, error = self.run_wsl_command(
-            wsl_cmd, 
-            'ls -la /dev/dri/ 2>/dev/null || echo "No GPU devices found"'
-        )
+        probe = self._probe(wsl_cmd)
+        success = probe is not None
+        output = probe['DRI'] if success else ""
         
+        has_gpu_devices = success and output not in ('', 'NONE')
         gpu_info = {
-            'has_gpu_devices': '/dev/dri' in output if success else False,
-            'gpu_devices': output if success else "None detected"
+            'has_gpu_devices': has_gpu_devices,
+            'gpu_devices': output if has_gpu_devices else "None detected"
         }
         
         if gpu_info['has_gpu_devices']:
@@ -140,13 +370,38 @@ class HardwareDetector:
         else:
             self.log("[INFO] No GPU devices detected in WSL")
         
-        self.detected_hardware['gpu_info'] = gpu_info
+        if success:
+            self._gpu_cache[key] = gpu_info
+        self._record('gpu_info', gpu_info)
         return gpu_info
     
-    def should_install_intel_gpu_support(self, wsl_cmd):
-        """Determine if Intel GPU OpenCL support should be installed"""
-        cpu_vendor = self.detect_cpu_vendor(wsl_cmd)
-        gpu_info = self.detect_gpu_info(wsl_cmd)
+    def detect_wsl_version(self, wsl_cmd):
+        """Detect whether the distribution runs under WSL2 ("WSL2", "WSL1", or None on failure)"""
+        key = tuple(wsl_cmd)
+        if key in self._wsl_version_cache:
+            return self._wsl_version_cache[key]
+        
+        probe = self._probe(wsl_cmd)
+        if probe is None:
+            return None
+        # WSL2 kernels end in "-microsoft-standard-WSL2"; the early 4.19 ones
+        # only say "-microsoft-standard" (WSL1 reports "-Microsoft")
+        kernel = probe['UNAME']
+        is_wsl2 = "WSL2" in kernel or "microsoft-standard" in kernel.lower()
+        wsl_version = "WSL2" if is_wsl2 else "WSL1"
+        self._wsl_version_cache[key] = wsl_version
+        return wsl_version
+    
+    def should_install_intel_gpu_support(self, wsl_cmd, cpu_vendor=None, gpu_info=None, wsl_version=None):
+        """Determine if Intel GPU OpenCL support should be installed.
+        Pass already-detected cpu_vendor/gpu_info/wsl_version to skip re-detection.
+        """
+        if cpu_vendor is None:
+            cpu_vendor = self.detect_cpu_vendor(wsl_cmd)
+        if gpu_info is None:
+            gpu_info = self.detect_gpu_info(wsl_cmd)
+        if wsl_version is None:
+            wsl_version = self.detect_wsl_version(wsl_cmd)
         
         # Install Intel GPU support if:
         # 1. CPU is Intel (likely has integrated graphics)
@@ -167,29 +422,22 @@ class HardwareDetector:
             reasons.append(f"{cpu_vendor} CPU detected (GPU support unknown)")
         
         # Check WSL version
-        success, wsl_version, _ = self.run_wsl_command(
-            wsl_cmd, 
-            'uname -r | grep -q "WSL2" && echo "WSL2" || echo "WSL1"'
-        )
-        
-        if success and "WSL2" in wsl_version:
+        if wsl_version == "WSL2":
             reasons.append("WSL2 detected (supports GPU passthrough)")
         else:
             should_install = False
             reasons.append("WSL2 not detected (GPU support limited)")
         
-        # Check Windows version (optional - don't fail if we can't detect)
-        try:
-            windows_version = platform.release()
-            if windows_version in ["10", "11"]:
-                reasons.append(f"Windows {windows_version} detected")
-            else:
-                reasons.append(f"Windows {windows_version} detected (compatibility unknown)")
-        except:
+        # Windows version is informational only; it does not affect the decision
+        if _WINDOWS_RELEASE in ["10", "11"]:
+            reasons.append(f"Windows {_WINDOWS_RELEASE} detected")
+        elif _WINDOWS_RELEASE:
+            reasons.append(f"Windows {_WINDOWS_RELEASE} detected (compatibility unknown)")
+        else:
             reasons.append("Windows version detection failed")
         
-        self.detected_hardware['intel_gpu_recommended'] = should_install
-        self.detected_hardware['intel_gpu_reasons'] = reasons
+        self._record('intel_gpu_recommended', should_install)
+        self._record('intel_gpu_reasons', reasons)
         
         if should_install:
             self.log("[OK] Intel GPU OpenCL support recommended")
@@ -204,127 +452,72 @@ class HardwareDetector:
     
     def get_intel_opencl_install_commands(self):
         """Get commands for Intel OpenCL installation"""
-        return [
-            # Remove conflicting packages
-            "sudo apt-get purge -y intel-opencl-icd intel-level-zero-gpu level-zero",
-            "sudo apt-get autoremove -y",
-            "sudo apt-get clean",
-            
-            # Install OpenCL loader and tools
-            "sudo apt-get update",
-            "sudo apt-get install -y ocl-icd-libopencl1 ocl-icd-opencl-dev opencl-headers clinfo",
-            
-            # Add Intel oneAPI repository
-            "wget -O- https://apt.repos.intel.com/intel-gpg-keys/GPG-PUB-KEY-INTEL-SW-PRODUCTS.PUB | gpg --dearmor | sudo tee /usr/share/keyrings/oneapi-archive-keyring.gpg > /dev/null",
-            'echo "deb [signed-by=/usr/share/keyrings/oneapi-archive-keyring.gpg] https://apt.repos.intel.com/oneapi all main" | sudo tee /etc/apt/sources.list.d/oneAPI.list',
-            
-            # Install Intel OpenCL runtime
-            "sudo apt-get update",
-            "sudo apt-get install -y intel-oneapi-runtime-opencl",
-            
-            # Add Intel Graphics PPA (optional but recommended)
-            "sudo apt-get install -y software-properties-common",
-            "sudo add-apt-repository -y ppa:kobuk-team/intel-graphics",
-            "sudo apt-get update", 
-            "sudo apt-get install -y intel-media-va-driver-non-free libmfx-gen1 libvpl2 libvpl-tools libva-glx2 va-driver-all vainfo",
-            
-            # Configure permissions
-            "sudo usermod -a -G render $USER"
-        ]
+        return INTEL_OPENCL_INSTALL_CMDS
     
     def get_intel_opencl_verification_commands(self):
         """Get commands to verify Intel OpenCL installation"""
-        return [
-            "clinfo",  # Should show Intel OpenCL platform
-            "clinfo | grep -i intel || echo 'No Intel OpenCL platform found'"
-        ]
+        return INTEL_OPENCL_VERIFY_CMDS
     
     def get_amd_gpu_support_commands(self):
         """Get commands for AMD GPU support installation"""
-        return [
-            # Remove conflicting packages
-            "sudo apt-get purge -y intel-opencl-icd intel-level-zero-gpu level-zero",
-            "sudo apt-get autoremove -y",
-            "sudo apt-get clean",
-            
-            # Install OpenCL loader and tools
-            "sudo apt-get update",
-            "sudo apt-get install -y ocl-icd-libopencl1 ocl-icd-opencl-dev opencl-headers clinfo",
-            
-            # Add AMD ROCm repository (for newer AMD GPUs)
-            "wget -qO - https://repo.radeon.com/rocm/rocm.gpg.key | sudo apt-key add -",
-            'echo "deb [arch=amd64] https://repo.radeon.com/rocm/apt/debian ubuntu main" | sudo tee /etc/apt/sources.list.d/rocm.list',
-            
-            # Install AMD OpenCL runtime
-            "sudo apt-get update",
-            "sudo apt-get install -y rocm-opencl-runtime",
-            
-            # Install Mesa drivers for older AMD GPUs
-            "sudo apt-get install -y mesa-opencl-icd",
-            
-            # Configure permissions
-            "sudo usermod -a -G render $USER"
-        ]
+        return AMD_GPU_SUPPORT_CMDS
     
     def get_arm_gpu_support_commands(self):
         """Get commands for ARM GPU support installation"""
-        return [
-            # Install OpenCL loader and tools
-            "sudo apt-get update",
-            "sudo apt-get install -y ocl-icd-libopencl1 ocl-icd-opencl-dev opencl-headers clinfo",
-            
-            # Install Mesa drivers (common for ARM Mali GPUs)
-            "sudo apt-get install -y mesa-opencl-icd",
-            
-            # Install ARM Mali drivers if available
-            "sudo apt-get install -y mali-g610-firmware || echo 'Mali firmware not available'",
-            
-            # Configure permissions
-            "sudo usermod -a -G render $USER"
-        ]
+        return ARM_GPU_SUPPORT_CMDS
     
-    def get_vendor_specific_optimizations(self, wsl_cmd):
-        """Get vendor-specific optimization commands"""
-        cpu_vendor = self.detect_cpu_vendor(wsl_cmd)
-        
-        if cpu_vendor == "Intel":
-            return {
-                'description': 'Intel CPU optimizations',
-                'commands': [
-                    # Intel-specific optimizations
-                    'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor',
-                    'echo 0 | sudo tee /proc/sys/kernel/nmi_watchdog',
-                    'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us'
-                ]
-            }
-        elif cpu_vendor == "AMD":
-            return {
-                'description': 'AMD CPU optimizations',
-                'commands': [
-                    # AMD-specific optimizations
-                    'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor',
-                    'echo 0 | sudo tee /proc/sys/kernel/nmi_watchdog',
-                    'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us'
-                ]
-            }
-        elif cpu_vendor == "ARM":
-            return {
-                'description': 'ARM CPU optimizations',
-                'commands': [
-                    # ARM-specific optimizations
-                    'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor 2>/dev/null || echo "CPU governor not available"',
-                    'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us'
-                ]
-            }
-        else:
+    def get_vendor_specific_optimizations(self, cpu_vendor):
+        """Get vendor-specific optimization commands for an already-detected CPU vendor"""
+        optimizations = VENDOR_OPTIMIZATIONS.get(cpu_vendor)
+        if optimizations is None:
             return {
                 'description': f'Generic optimizations for {cpu_vendor}',
-                'commands': [
-                    # Generic optimizations
-                    'echo "performance" | sudo tee /sys/devices/system/cpu/cpu*/cpufreq/scaling_governor 2>/dev/null || echo "CPU governor not available"',
-                    'echo 1 | sudo tee /proc/sys/kernel/sched_rt_runtime_us'
-                ]
+                'commands': GENERIC_OPTIMIZATION_CMDS
             }
+        return optimizations
+    
+    def _run_streaming(self, cmd, timeout, on_line):
+        """Run cmd and pass each output line (stdout and stderr merged) to on_line as it arrives.
+        Returns the exit code, or None if the command could not start or timed out.
+        """
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1,
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            )
+        except OSError as e:
+            self.log(f"[WARN] Could not start command: {e}")
+            return None
+        
+        # Reading the pipe blocks, so the timeout is enforced by killing the process
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            process.kill()
+        
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            for line in process.stdout:
+                on_line(line.rstrip())
+            returncode = process.wait()
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            timer.cancel()
+        
+        if timed_out.is_set():
+            self.log(f"[WARN] Command timed out after {timeout}s")
+            return None
+        return returncode
     
     def install_intel_gpu_support(self, wsl_cmd, run_command_func):
         """Install Intel GPU OpenCL support"""
@@ -332,20 +525,42 @@ class HardwareDetector:
         
         install_commands = self.get_intel_opencl_install_commands()
         
+        # Run every command in one bash invocation (one WSL entry instead of one per
+        # command); after each command the script prints "::STEP:: <i> <exit code>",
+        # and the output is streamed so progress shows while apt runs
+        script_lines = []
+        timeout = 0
         for i, cmd in enumerate(install_commands, 1):
-            self.log(f"[{i}/{len(install_commands)}] Running: {cmd}")
-            
+            script_lines.append(cmd)
+            script_lines.append(f'echo "{self.STEP_MARKER} {i} $?"')
             # Use longer timeout for package operations
-            timeout = 300 if any(pkg_cmd in cmd for pkg_cmd in ['apt-get', 'add-apt-repository']) else 60
-            
-            ret, out, err = run_command_func(wsl_cmd + ['bash', '-c', cmd], timeout=timeout)
-            
-            if ret != 0:
-                self.log(f"[WARN] Warning: Command failed (continuing): {cmd}")
-                if err:
-                    self.log(f"  Error: {err}")
+            timeout += 300 if any(pkg_cmd in cmd for pkg_cmd in ['apt-get', 'add-apt-repository']) else 60
+        
+        total = len(install_commands)
+        step_results = {}
+        
+        def on_line(line):
+            # Report each command as soon as its marker arrives, then announce the next one
+            if not line.startswith(self.STEP_MARKER):
+                if line:
+                    self.log(f"  {line}")
+                return
+            _, step, code = line.split()
+            step, code = int(step), int(code)
+            step_results[step] = code
+            if code != 0:
+                self.log(f"[WARN] Warning: Command failed (continuing): {install_commands[step - 1]}")
             else:
                 self.log(f"[OK] Command completed successfully")
+            if step < total:
+                self.log(f"[{step + 1}/{total}] Running: {install_commands[step]}")
+        
+        self.log(f"[1/{total}] Running: {install_commands[0]}")
+        self._run_streaming(wsl_cmd + ['bash', '-c', '\n'.join(script_lines)], timeout, on_line)
+        
+        for i, cmd in enumerate(install_commands, 1):
+            if i not in step_results:
+                self.log(f"[WARN] Warning: Command did not complete (install script stopped or timed out): {cmd}")
         
         # Verify installation
         self.log("Verifying Intel OpenCL installation...")
@@ -355,25 +570,35 @@ class HardwareDetector:
             ret, out, err = run_command_func(wsl_cmd + ['bash', '-c', cmd], timeout=30)
             if ret == 0 and out:
                 self.log(f"[OK] Verification: {out}")
+                # Look for the Intel platform in the same output instead of re-running clinfo
+                intel_lines = [line for line in out.splitlines() if 'intel' in line.lower()]
+                if intel_lines:
+                    self.log(f"[OK] Intel OpenCL platform found: {intel_lines[0].strip()}")
+                else:
+                    self.log("[INFO] No Intel OpenCL platform found")
             else:
                 self.log(f"[INFO] Verification output: {err if err else 'No output'}")
     
-    def detect_and_configure_hardware(self, wsl_cmd, run_command_func):
-        """Main method to detect hardware and configure optimizations"""
+    def detect_and_configure_hardware(self, wsl_cmd, run_command_func, force_gpu_install=False):
+        """Main method to detect hardware and configure optimizations.
+        The GPU runtime install is skipped when WSL exposes no /dev/dri, unless force_gpu_install.
+        """
         self.log("=== HARDWARE DETECTION AND CONFIGURATION ===")
         
-        # Detect CPU
+        # All four detections read the same batched WSL probe (see _probe)
         cpu_vendor = self.detect_cpu_vendor(wsl_cmd)
         cpu_features = self.detect_cpu_features(wsl_cmd)
-        
-        # Detect GPU
         gpu_info = self.detect_gpu_info(wsl_cmd)
+        wsl_version = self.detect_wsl_version(wsl_cmd)
         
         # Configure vendor-specific optimizations
         if cpu_vendor == "Intel":
-            should_install_gpu = self.should_install_intel_gpu_support(wsl_cmd)
+            should_install_gpu = self.should_install_intel_gpu_support(wsl_cmd, cpu_vendor, gpu_info, wsl_version)
             
-            if should_install_gpu:
+            # The multi-minute apt install cannot produce a working runtime without /dev/dri
+            if should_install_gpu and not gpu_info['has_gpu_devices'] and not force_gpu_install:
+                self.log("[INFO] No /dev/dri in WSL - skipping Intel GPU OpenCL support installation")
+            elif should_install_gpu:
                 try:
                     self.install_intel_gpu_support(wsl_cmd, run_command_func)
                     self.log("[OK] Intel GPU OpenCL support installation completed")
@@ -386,7 +611,7 @@ class HardwareDetector:
             self.log("[OK] AMD CPU detected - configuring AMD-specific optimizations")
             try:
                 # Apply AMD optimizations
-                optimizations = self.get_vendor_specific_optimizations(wsl_cmd)
+                optimizations = self.get_vendor_specific_optimizations(cpu_vendor)
                 self.log(f"Applying {optimizations['description']}...")
                 
                 for cmd in optimizations['commands']:
@@ -406,7 +631,7 @@ class HardwareDetector:
             self.log("[OK] ARM CPU detected - configuring ARM-specific optimizations")
             try:
                 # Apply ARM optimizations
-                optimizations = self.get_vendor_specific_optimizations(wsl_cmd)
+                optimizations = self.get_vendor_specific_optimizations(cpu_vendor)
                 self.log(f"Applying {optimizations['description']}...")
                 
                 for cmd in optimizations['commands']:
@@ -426,7 +651,7 @@ class HardwareDetector:
             self.log(f"[OK] {cpu_vendor} CPU detected - applying generic optimizations")
             try:
                 # Apply generic optimizations
-                optimizations = self.get_vendor_specific_optimizations(wsl_cmd)
+                optimizations = self.get_vendor_specific_optimizations(cpu_vendor)
                 self.log(f"Applying {optimizations['description']}...")
                 
                 for cmd in optimizations['commands']:
@@ -442,84 +667,159 @@ class HardwareDetector:
         self.log("=== HARDWARE CONFIGURATION COMPLETE ===")
         return self.detected_hardware
     
-    def detect_gpu_hardware(self):
-        """Detect GPU hardware and return detection results for the installer"""
+    def _list_video_controllers(self):
+        """Return [{'Name': ..., 'AdapterCompatibility': ...}] for the display adapters.
+        Queries WMI in-process through pywin32, then EnumDisplayDevicesW, and only
+        launches PowerShell (CLR startup dominates its cost) when neither works.
+        """
+        for query in (self._video_controllers_from_wmi,
+                      self._video_controllers_from_display_devices,
+                      self._video_controllers_from_powershell):
+            try:
+                gpus = query()
+            except Exception as e:
+                self.log(f"GPU query {query.__name__} failed: {e}")
+                continue
+            if gpus:
+                return gpus
+        return []
+    
+    def _video_controllers_from_wmi(self):
+        """Win32_VideoController via pywin32's COM bindings"""
+        import pythoncom
+        import win32com.client
+        
         try:
-            import subprocess
-            import platform
-            
-            # Default results
-            results = {
-                'gpu_acceleration': 'CPU_ONLY',
-                'nvidia_rtx_detected': False,
-                'intel_arc_detected': False,
-                'intel_integrated_detected': False,
-                'nvidia_gpu_name': '',
-                'intel_gpu_name': ''
-            }
+            pythoncom.CoInitialize()  # Detection may run off the main thread
+        except pythoncom.com_error as e:
+            # e.g. RPC_E_CHANGED_MODE: the thread already uses another apartment model
+            self.log(f"WMI query skipped, COM initialisation failed: {e}")
+            return []
+        wmi = rows = None
+        try:
+            wmi = win32com.client.GetObject('winmgmts:root\\cimv2')
+            rows = wmi.ExecQuery('SELECT Name, AdapterCompatibility FROM Win32_VideoController')
+            return [
+                {'Name': gpu.Name or '', 'AdapterCompatibility': gpu.AdapterCompatibility or ''}
+                for gpu in rows
+            ]
+        finally:
+            # Release the COM proxies before COM is torn down on this thread
+            wmi = rows = None
+            pythoncom.CoUninitialize()
+    
+    def _video_controllers_from_display_devices(self):
+        """Adapter names from user32.EnumDisplayDevicesW (one entry per output, deduplicated)"""
+        import ctypes
+        from ctypes import wintypes
+        
+        class DISPLAY_DEVICEW(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('DeviceName', wintypes.WCHAR * 32),
+                ('DeviceString', wintypes.WCHAR * 128),
+                ('StateFlags', wintypes.DWORD),
+                ('DeviceID', wintypes.WCHAR * 128),
+                ('DeviceKey', wintypes.WCHAR * 128),
+            ]
+        
+        device = DISPLAY_DEVICEW()
+        device.cb = ctypes.sizeof(device)
+        names = []
+        index = 0
+        while ctypes.windll.user32.EnumDisplayDevicesW(None, index, ctypes.byref(device), 0):
+            if device.DeviceString and device.DeviceString not in names:
+                names.append(device.DeviceString)
+            index += 1
+        return [{'Name': name, 'AdapterCompatibility': ''} for name in names]
+    
+    def _video_controllers_from_powershell(self):
+        """Win32_VideoController via a PowerShell subprocess (last resort)"""
+        ps_cmd = [
+            'powershell.exe', '-Command',
+            'Get-CimInstance Win32_VideoController | Select-Object Name, AdapterCompatibility | ConvertTo-Csv -NoTypeInformation'
+        ]
+        
+        result = subprocess.run(ps_cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode != 0 or not result.stdout.strip():
+            return []
+        
+        # CSV has one row per adapter regardless of count (ConvertTo-Json collapses a single one)
+        return list(csv.DictReader(io.StringIO(result.stdout)))
+    
+    def _default_gpu_results(self):
+        """CPU-only detection results"""
+        return {
+            'gpu_acceleration': 'CPU_ONLY',
+            'nvidia_rtx_detected': False,
+            'intel_arc_detected': False,
+            'intel_integrated_detected': False,
+            'nvidia_gpu_name': '',
+            'intel_gpu_name': ''
+        }
+    
+    def _detect_gpu_windows(self):
+        """Classify the Windows display adapters"""
+        results = self._default_gpu_results()
+        
+        try:
+            gpus = self._list_video_controllers()
             
-            # Try to detect GPUs using PowerShell (Windows-specific)
-            if platform.system() == "Windows":
-                try:
-                    # Run PowerShell GPU detection
-                    ps_cmd = [
-                        'powershell.exe', '-Command',
-                        'Get-CimInstance Win32_VideoController | Select-Object Name, AdapterCompatibility | ConvertTo-Json'
-                    ]
+            if gpus:
+                for gpu in gpus:
+                    match = self.GPU_CLASS_RE.search(gpu.get('Name', ''))
+                    gpu_class = match.lastgroup if match else None
                     
-                    result = subprocess.run(ps_cmd, capture_output=True, text=True, timeout=30)
-                    
-                    if result.returncode == 0 and result.stdout.strip():
-                        import json
-                        gpus = json.loads(result.stdout)
+                    # Check for NVIDIA RTX
+                    if gpu_class == 'nvidia_rtx':
+                        results['nvidia_rtx_detected'] = True
+                        results['nvidia_gpu_name'] = gpu.get('Name', 'NVIDIA RTX GPU')
+                        results['gpu_acceleration'] = 'NVIDIA_RTX'
                         
-                        # Handle single GPU vs multiple GPUs
-                        if not isinstance(gpus, list):
-                            gpus = [gpus]
+                    # Check for Intel Arc
+                    elif gpu_class == 'intel_arc':
+                        results['intel_arc_detected'] = True
+                        results['intel_gpu_name'] = gpu.get('Name', 'Intel Arc GPU')
+                        results['gpu_acceleration'] = 'INTEL_ARC'
                         
-                        for gpu in gpus:
-                            gpu_name = gpu.get('Name', '').lower()
-                            
-                            # Check for NVIDIA RTX
-                            if 'nvidia' in gpu_name and 'rtx' in gpu_name:
-                                results['nvidia_rtx_detected'] = True
-                                results['nvidia_gpu_name'] = gpu.get('Name', 'NVIDIA RTX GPU')
-                                results['gpu_acceleration'] = 'NVIDIA_RTX'
-                                
-                            # Check for Intel Arc
-                            elif 'intel' in gpu_name and 'arc' in gpu_name:
-                                results['intel_arc_detected'] = True
-                                results['intel_gpu_name'] = gpu.get('Name', 'Intel Arc GPU')
-                                results['gpu_acceleration'] = 'INTEL_ARC'
-                                
-                            # Check for Intel integrated graphics
-                            elif 'intel' in gpu_name and any(x in gpu_name for x in ['uhd', 'iris', 'hd graphics']):
-                                results['intel_integrated_detected'] = True
-                                results['intel_gpu_name'] = gpu.get('Name', 'Intel Integrated Graphics')
-                                if results['gpu_acceleration'] == 'CPU_ONLY':
-                                    results['gpu_acceleration'] = 'INTEL_INTEGRATED'
+                    # Check for Intel integrated graphics
+                    elif gpu_class == 'intel_integrated':
+                        results['intel_integrated_detected'] = True
+                        results['intel_gpu_name'] = gpu.get('Name', 'Intel Integrated Graphics')
+                        if results['gpu_acceleration'] == 'CPU_ONLY':
+                            results['gpu_acceleration'] = 'INTEL_INTEGRATED'
+                
+                # If we found any GPU, update acceleration type
+                if results['nvidia_rtx_detected'] or results['intel_arc_detected'] or results['intel_integrated_detected']:
+                    if results['gpu_acceleration'] == 'CPU_ONLY':
+                        results['gpu_acceleration'] = 'GPU_ACCELERATED'
+                
+                _save_hw_cache(results)
                         
-                        # If we found any GPU, update acceleration type
-                        if any([results['nvidia_rtx_detected'], results['intel_arc_detected'], results['intel_integrated_detected']):
-                            if results['gpu_acceleration'] == 'CPU_ONLY':
-                                results['gpu_acceleration'] = 'GPU_ACCELERATED'
-                                
-                except Exception as e:
-                    self.log(f"PowerShell GPU detection failed: {e}")
-            
-            return results
-            
+        except Exception as e:
+            self.log(f"GPU enumeration failed: {e}")
+        
+        return results
+    
+    def _detect_gpu_linux(self):
+        """No host GPU enumeration outside Windows (build machines, tests)"""
+        return self._default_gpu_results()
+    
+    def detect_gpu_hardware(self, force=False):
+        """Detect GPU hardware and return detection results for the installer.
+        Results are cached on disk for HW_CACHE_TTL; force=True re-detects.
+        """
+        if not force:
+            cached = _load_hw_cache()
+            if cached is not None:
+                return cached
+        
+        try:
+            return self._detect_gpu()
         except Exception as e:
             self.log(f"GPU detection failed: {e}")
             # Return default CPU-only results
-            return {
-                'gpu_acceleration': 'CPU_ONLY',
-                'nvidia_rtx_detected': False,
-                'intel_arc_detected': False,
-                'intel_integrated_detected': False,
-                'nvidia_gpu_name': '',
-                'intel_gpu_name': ''
-            }
+            return self._default_gpu_results()
 
 
 # Example usage for testing
@@ -530,12 +830,12 @@ if __name__ == "__main__":
     print("- detect_cpu_vendor(wsl_cmd) - Supports Intel, AMD, ARM, VIA, Centaur, etc.")
     print("- detect_cpu_features(wsl_cmd)")  
     print("- detect_gpu_info(wsl_cmd)")
-    print("- should_install_intel_gpu_support(wsl_cmd)")
+    print("- should_install_intel_gpu_support(wsl_cmd, cpu_vendor=None, gpu_info=None, wsl_version=None)")
     print("- install_intel_gpu_support(wsl_cmd, run_command_func)")
     print("- get_amd_gpu_support_commands()")
     print("- get_arm_gpu_support_commands()")
-    print("- get_vendor_specific_optimizations(wsl_cmd)")
-    print("- detect_and_configure_hardware(wsl_cmd, run_command_func)")
+    print("- get_vendor_specific_optimizations(cpu_vendor)")
+    print("- detect_and_configure_hardware(wsl_cmd, run_command_func, force_gpu_install=False)")
     print("- detect_gpu_hardware() - NEW: Detects GPU hardware for installer")
     
     # Test GPU detection
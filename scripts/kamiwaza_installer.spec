@@ -0,0 +1,65 @@
+# -*- mode: python ; coding: utf-8 -*-
+# PyInstaller spec for kamiwaza_installer (one-dir build).
+# Used by build_simple_installer.py; the manifest and icon are looked up in
+# the repository root, the entry script next to this file.
+
+import os
+import shutil
+import sys
+
+ROOT_DIR = os.path.dirname(SPECPATH)
+sys.path.insert(0, ROOT_DIR)
+
+from _build_common import UPX_EXCLUDE
+
+# Strip debug symbols from bundled binaries only on request (KAMIWAZA_BUILD_STRIP=1):
+# PyInstaller advises against it on Windows, and an arbitrary strip on PATH
+# (e.g. MinGW from Git for Windows) can corrupt DLLs/.pyd files or their signatures
+STRIP = os.environ.get('KAMIWAZA_BUILD_STRIP') == '1' and shutil.which('strip') is not None
+
+manifest = os.path.join(ROOT_DIR, 'uac_admin.manifest')
+icon = os.path.join(ROOT_DIR, 'icon.ico')
+
+
+a = Analysis(
+    [os.path.join(SPECPATH, 'windows_installer.py')],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[],
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='kamiwaza_installer',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=STRIP,
+    upx=True,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    manifest=manifest if os.path.exists(manifest) else None,
+    icon=icon if os.path.exists(icon) else None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=STRIP,
+    upx=True,
+    upx_exclude=UPX_EXCLUDE,
+    name='kamiwaza_installer',
+)
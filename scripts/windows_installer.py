@@ -338,10 +338,8 @@ class KamiwazaInstaller(tk.Tk):
             appx_file = "Ubuntu.appx"
             
             self.log_output(f"Downloading Ubuntu from {ubuntu_url}...")
-            download_cmd = f"""
-                Invoke-WebRequest -Uri '{ubuntu_url}' -OutFile '{appx_file}' -UseBasicParsing
-            """
-            ret, out, err = self.run_command(['powershell', '-Command', download_cmd], timeout=300)
+            # curl.exe ships with Windows 10+ and avoids Invoke-WebRequest's buffering
+            ret, out, err = self.run_command(['curl.exe', '-sSL', '--fail', '-o', appx_file, ubuntu_url], timeout=300)
             if ret != 0:
                 self.log_output(f"Failed to download Ubuntu: {err}")
                 return False
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the installer package built by scripts/build_simple_installer.py
+"""
+
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import build_simple_installer
+
+def _make_dist_tree(root):
+    """Lay out a minimal dist/ the way build_executable and the script writers leave it."""
+    app_dir = root / "dist" / "kamiwaza_installer"
+    (app_dir / "_internal").mkdir(parents=True)
+    files = {
+        "kamiwaza_installer/kamiwaza_installer.exe": os.urandom(4096),  # Incompressible
+        "kamiwaza_installer/_internal/base_library.zip": b"PK" + b"\0" * 8192,
+        "kamiwaza_installer/_internal/readme.txt": b"kamiwaza\r\n" * 500,
+    }
+    for name, data in files.items():
+        (root / "dist" / name).write_bytes(data)
+    (root / "dist" / "install.bat").write_text("@echo off\r\n")
+    (root / "dist" / "uninstall.bat").write_text("@echo off\r\n")
+    return files
+
+def test_create_zip_installer_writes_valid_archive(tmp_path, monkeypatch):
+    """The package passes testzip(), holds every dist file unchanged and stores incompressible ones."""
+    files = _make_dist_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    assert build_simple_installer.create_zip_installer()
+
+    with zipfile.ZipFile(tmp_path / "Kamiwaza_Installer.zip") as zf:
+        assert zf.testzip() is None
+        names = set(zf.namelist())
+        assert {"install.bat", "uninstall.bat", "README.txt"} <= names
+        for name, data in files.items():
+            assert zf.read(name) == data
+        # Incompressible binaries are stored, everything else deflated
+        assert zf.getinfo("kamiwaza_installer/kamiwaza_installer.exe").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("kamiwaza_installer/_internal/readme.txt").compress_type == zipfile.ZIP_DEFLATED
+
+def test_build_inputs_resolve_from_repo_root():
+    """Manifest, icon and requirements are hashed from the repo root, not the cwd."""
+    root = Path(build_simple_installer.SCRIPT_DIR).parent
+    for name in ("requirements.txt", "uac_admin.manifest", "icon.ico"):
+        assert str(root / name) in build_simple_installer.BUILD_INPUTS
+
+def test_hash_inputs_changes_when_file_appears(tmp_path):
+    """A missing input is hashed as a marker, so creating it invalidates the cache."""
+    path = tmp_path / "icon.ico"
+    missing = build_simple_installer._hash_inputs([str(path)])
+    path.write_bytes(b"")
+    assert build_simple_installer._hash_inputs([str(path)]) != missing
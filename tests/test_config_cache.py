@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the hash-keyed config.yaml cache in _config_cache.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import _config_cache
+
+CONFIG = """kamiwaza_version: 0.5.1
+codename: noble
+build_number: 442
+arch: x86_64
+deb_file_url: https://example.invalid/kamiwaza_v0.5.1_noble_x86_64_build442.deb
+"""
+
+@pytest.fixture
+def config_path(tmp_path):
+    """A config.yaml in a temporary directory"""
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG, encoding="utf-8")
+    return path
+
+def _cache_path(config_path):
+    return Path(str(config_path) + ".cache.pkl")
+
+def _fail_parse(raw):
+    raise AssertionError("YAML was parsed despite a valid cache")
+
+def test_load_parses_and_coerces(config_path):
+    """Values come through with the dataclass field types; unknown or missing keys use defaults"""
+    config = _config_cache.load(config_path)
+    assert config.kamiwaza_version == "0.5.1"
+    assert config.build_number == 442
+    assert config.r2_endpoint_url == ""
+    assert _cache_path(config_path).exists()
+
+def test_load_hits_cache(config_path, monkeypatch):
+    """An unchanged config.yaml is served from the pickle without parsing"""
+    first = _config_cache.load(config_path)
+    monkeypatch.setattr(_config_cache, "_parse", _fail_parse)
+    assert _config_cache.load(config_path) == first
+
+def test_load_invalidates_on_change(config_path):
+    """Editing config.yaml changes the digest and the cached value is rebuilt"""
+    _config_cache.load(config_path)
+    config_path.write_text(CONFIG.replace("build_number: 442", "build_number: '443'"), encoding="utf-8")
+    assert _config_cache.load(config_path).build_number == 443
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:len(data) // 2],   # Truncated pickle
+    lambda data: data[:16] + b"garbage",  # Valid digest, unreadable payload
+    lambda data: b"",                     # Empty file
+])
+def test_load_recovers_from_corrupt_cache(config_path, monkeypatch, corrupt):
+    """A damaged cache falls back to the YAML and is rewritten"""
+    expected = _config_cache.load(config_path)
+    cache = _cache_path(config_path)
+    cache.write_bytes(corrupt(cache.read_bytes()))
+
+    assert _config_cache.load(config_path) == expected
+    monkeypatch.setattr(_config_cache, "_parse", _fail_parse)
+    assert _config_cache.load(config_path) == expected
+
+def test_load_invalidates_on_schema_change(config_path, monkeypatch):
+    """A cache written for different field types is not reused"""
+    _config_cache.load(config_path)
+    monkeypatch.setattr(_config_cache, "_SCHEMA", b"{'build_number': <class 'str'>}")
+    monkeypatch.setattr(_config_cache, "_parse", lambda raw: "reparsed")
+    assert _config_cache.load(config_path) == "reparsed"
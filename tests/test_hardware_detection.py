@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the parsing in scripts/hardware_detection.py (no WSL or Windows needed)
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import hardware_detection
+from hardware_detection import HardwareDetector
+
+WSL_CMD = ['wsl', '-d', 'kamiwaza', '--']
+
+INTEL_CPUINFO = """processor\t: 0
+vendor_id\t: GenuineIntel
+model name\t: 13th Gen Intel(R) Core(TM) i7-1365U
+flags\t\t: fpu sse4_1 sse4_2 aes avx avx2
+"""
+
+ARM_CPUINFO = """processor\t: 0
+BogoMIPS\t: 38.40
+Features\t: fp asimd aes crc32 atomics
+CPU implementer\t: 0x41
+"""
+
+def _probe_output(cpuinfo, dtmodel='', uname='5.15.167.4-microsoft-standard-WSL2', dri='card0\nrenderD128'):
+    """PROBE_SCRIPT output as WSL would print it"""
+    return (f"===CPUINFO===\n{cpuinfo}\n===DTMODEL===\n{dtmodel}\n"
+            f"===UNAME===\n{uname}\n===DRI===\n{dri}\n===END===")
+
+def _detector(output, success=True, error=''):
+    """HardwareDetector whose WSL calls return the given probe output"""
+    detector = HardwareDetector(logger=lambda message: None)
+    detector.calls = 0
+
+    def run_wsl_command(wsl_cmd, command, timeout=30):
+        detector.calls += 1
+        return success, output, error
+
+    detector.run_wsl_command = run_wsl_command
+    return detector
+
+@pytest.mark.parametrize("name, expected", [
+    ("NVIDIA GeForce RTX 4090", "nvidia_rtx"),
+    ("RTX A2000 Laptop GPU (NVIDIA)", "nvidia_rtx"),  # Keyword order does not matter
+    ("NVIDIA GeForce GTX 1080", None),
+    ("Intel(R) Arc(TM) A770 Graphics", "intel_arc"),
+    ("Arc A380 by Intel", "intel_arc"),
+    ("Intel(R) UHD Graphics 770", "intel_integrated"),
+    ("Intel(R) Iris(R) Xe Graphics", "intel_integrated"),
+    ("Intel(R) HD Graphics 620", "intel_integrated"),
+    ("AMD Radeon RX 7900 XTX", None),
+    ("Microsoft Basic Display Adapter", None),
+    ("", None),
+])
+def test_gpu_class(name, expected):
+    """GPU names classify like the original substring checks"""
+    match = HardwareDetector.GPU_CLASS_RE.search(name)
+    assert (match.lastgroup if match else None) == expected
+
+@pytest.mark.parametrize("gpus, acceleration", [
+    ([], "CPU_ONLY"),
+    ([{"Name": "Intel(R) UHD Graphics 770"}], "INTEL_INTEGRATED"),
+    ([{"Name": "Intel(R) UHD Graphics 770"}, {"Name": "NVIDIA GeForce RTX 3060"}], "NVIDIA_RTX"),
+    ([{"Name": "Intel(R) Arc(TM) A750 Graphics"}], "INTEL_ARC"),
+    ([{"Name": "AMD Radeon RX 6600"}], "CPU_ONLY"),
+])
+def test_detect_gpu_windows(monkeypatch, gpus, acceleration):
+    """Adapter lists map to the expected acceleration type"""
+    monkeypatch.delenv("LOCALAPPDATA", raising=False)  # Keep the result cache off disk
+    detector = HardwareDetector(logger=lambda message: None)
+    monkeypatch.setattr(detector, "_list_video_controllers", lambda: gpus)
+    assert detector._detect_gpu_windows()['gpu_acceleration'] == acceleration
+
+@pytest.mark.parametrize("cpuinfo, expected", [
+    (INTEL_CPUINFO, "Intel"),
+    ("vendor_id\t: AuthenticAMD\n", "AMD"),
+    ("vendor_id\t: CentaurHauls\n", "Centaur"),
+    ("vendor_id\t: HygonGenuine\n", "HygonGenuine"),  # Unmapped ids are passed through
+    (ARM_CPUINFO + "\nRaspberry Pi 4 Model B (ARM Cortex-A72)", "ARM"),
+    ("model name\t: VIA Nano\n", "VIA"),
+    ("", "Unknown"),
+])
+def test_parse_cpu_vendor(cpuinfo, expected):
+    """/proc/cpuinfo text maps to a vendor name"""
+    assert HardwareDetector(logger=lambda message: None)._parse_cpu_vendor(cpuinfo) == expected
+
+def test_probe_sections_feed_every_detector():
+    """One probe call is split into sections and shared by all detectors"""
+    detector = _detector(_probe_output(INTEL_CPUINFO))
+
+    assert detector.detect_cpu_vendor(WSL_CMD) == "Intel"
+    features = detector.detect_cpu_features(WSL_CMD)
+    assert features['avx2'] and features['sse4_2'] and not features['neon']
+    assert detector.detect_gpu_info(WSL_CMD) == {'has_gpu_devices': True, 'gpu_devices': 'card0\nrenderD128'}
+    assert detector.detect_wsl_version(WSL_CMD) == "WSL2"
+    assert detector.calls == 1
+
+def test_probe_arm_without_dri():
+    """ARM features come from the Features line; a missing /dev/dri reports no devices"""
+    detector = _detector(_probe_output(ARM_CPUINFO, dtmodel="Raspberry Pi 4 Model B", uname="4.4.0-19041-Microsoft", dri="NONE"))
+
+    features = detector.detect_cpu_features(WSL_CMD)
+    assert features['asimd'] and features['aes'] and not features['avx']
+    assert detector.detect_gpu_info(WSL_CMD)['has_gpu_devices'] is False
+    assert detector.detect_wsl_version(WSL_CMD) == "WSL1"
+
+@pytest.mark.parametrize("output, success", [
+    (_probe_output(INTEL_CPUINFO).replace("===END===", ""), True),  # Truncated output
+    ("", False),
+])
+def test_probe_failure_is_not_cached(output, success):
+    """A failed or incomplete probe returns None and is retried on the next call"""
+    detector = _detector(output, success=success, error="timed out")
+
+    assert detector._probe(WSL_CMD) is None
+    assert detector.detect_cpu_vendor(WSL_CMD) == "Unknown"
+    assert detector.detect_wsl_version(WSL_CMD) is None
+    assert detector.calls == 3
+
+@pytest.mark.parametrize("timestamp, results, hit", [
+    ("now", {"gpu_acceleration": "NVIDIA_RTX"}, True),
+    ("yesterday", {"gpu_acceleration": "NVIDIA_RTX"}, False),  # Stale
+    ("1700000000", {"gpu_acceleration": "NVIDIA_RTX"}, False),  # Timestamp as a string
+    (None, {"gpu_acceleration": "NVIDIA_RTX"}, False),
+    (True, {"gpu_acceleration": "NVIDIA_RTX"}, False),
+    ("now", ["NVIDIA_RTX"], False),  # Results not a dict
+    ("now", None, False),
+])
+def test_load_hw_cache_validates_entries(tmp_path, monkeypatch, timestamp, results, hit):
+    """Only a fresh cache with a numeric timestamp and dict results is returned"""
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    timestamp = {"now": time.time(), "yesterday": time.time() - hardware_detection.HW_CACHE_TTL - 60}.get(timestamp, timestamp)
+    path = tmp_path / "Kamiwaza" / "hwcache.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"signature": hardware_detection._hw_signature(),
+                                "timestamp": timestamp, "results": results}), encoding="utf-8")
+    assert hardware_detection._load_hw_cache() == (results if hit else None)